@@ -1,3 +1,36 @@
+// data/ 폴더 기준 경로 (pages 폴더 안의 페이지면 한 단계 위)
+function dataBasePath() {
+    return window.location.pathname.includes('/pages/') ? '../data/' : 'data/';
+}
+
+// data/current.json이 가리키는 내용 해시 이름의 파일을 불러옴
+// current.json만 매번 서버에 확인하고, 해시 이름 파일은 브라우저 캐시를 그대로 사용
+// 목록 파일이 없거나 읽을 수 없으면 예전 경로(data/<이름>.json)로 대체
+let dataPointerReady = null;
+
+function loadDataPointer() {
+    if (!dataPointerReady) {
+        dataPointerReady = fetch(dataBasePath() + 'current.json', { cache: 'no-cache' })
+            .then(response => response.ok ? response.json() : null)
+            .catch(() => null);
+    }
+    return dataPointerReady;
+}
+
+async function fetchDataFile(name) {
+    const pointer = await loadDataPointer();
+    const entry = pointer && pointer.files && pointer.files[name];
+    if (entry) {
+        try {
+            const response = await fetch(dataBasePath() + entry.file);
+            if (response.ok) return response;
+        } catch (error) {
+            console.error(`Error loading ${entry.file}:`, error);
+        }
+    }
+    return fetch(dataBasePath() + name + '.json');
+}
+
 document.addEventListener('DOMContentLoaded', () => {
     const path = window.location.pathname;
     const isInPagesFolder = path.includes('/pages/');
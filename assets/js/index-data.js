@@ -1,7 +1,7 @@
 document.addEventListener('DOMContentLoaded', async function() {
     try {
         // 연구원 정보 데이터 불러오기
-        const response = await fetch('data/institutes.json');
+        const response = await fetchDataFile('institutes');
         const institutes = await response.json();
 
         const instituteListContainer = document.getElementById('institute-list-container');
@@ -22,3 +22,29 @@ document.addEventListener('DOMContentLoaded', async function() {
         }
     }
 });
+
+// 최근 추가된 자료 (전체 자료 대신 작은 data/recent.json만 받음)
+const RECENT_DISPLAY_LIMIT = 10;
+
+document.addEventListener('DOMContentLoaded', async function() {
+    const recentContainer = document.getElementById('recent-materials-container');
+    if (!recentContainer) return;
+    try {
+        const response = await fetch('data/recent.json', { cache: 'no-cache' });
+        const recent = response.ok ? await response.json() : { items: [] };
+        const items = (recent.items || []).slice(0, RECENT_DISPLAY_LIMIT);
+        if (items.length === 0) {
+            recentContainer.innerHTML = '<p>최근 추가된 자료가 없습니다.</p>';
+            return;
+        }
+        let listHtml = '<ul>';
+        items.forEach(item => {
+            listHtml += `<li><a href="${item.url}" target="_blank">${item.title}</a> (${item.institute}, ${item.added.slice(0, 10)})</li>`;
+        });
+        listHtml += '</ul>';
+        recentContainer.innerHTML = listHtml;
+    } catch (error) {
+        console.error('최근 자료를 불러오는 중 오류 발생:', error);
+        recentContainer.innerHTML = '<p>최근 자료를 불러오는 데 실패했습니다.</p>';
+    }
+});
@@ -1,75 +1,119 @@
-// 샘플 데이터 (나중에 실제 데이터로 대체할 수 있습니다)
-const searchData = [
-    {
-        id: "report001",
-        title: "2025 교육과정 개정 연구",
-        institute: "서울교육연구정보원",
-        type: "report",
-        year: 2025,
-        tags: ["교육과정", "개정", "연구"],
-        url: "https://serii.sen.go.kr"
-    },
-    {
-        id: "report002",
-        title: "AI 활용 교육 방안 연구",
-        institute: "부산교육연구소",
-        type: "report",
-        year: 2024,
-        tags: ["AI", "인공지능", "교육"],
-        url: "#"
-    },
-    {
-        id: "guide001",
-        title: "AI를 활용한 과학 탐구 수업",
-        institute: "서울교육연구정보원",
-        type: "guide",
-        subject: "과학",
-        grade: "middle",
-        year: 2025,
-        tags: ["AI", "과학", "탐구"],
-        url: "#"
-    },
-    {
-        id: "guide002",
-        title: "데이터 시각화로 배우는 통계",
-        institute: "부산교육연구소",
-        type: "guide",
-        subject: "수학",
-        grade: "high",
-        year: 2024,
-        tags: ["통계", "데이터", "시각화"],
-        url: "#"
-    },
-    {
-        id: "guide003",
-        title: "디지털 스토리텔링 국어 수업",
-        institute: "대구창의융합교육원",
-        type: "guide",
-        subject: "국어",
-        grade: "elementary",
-        year: 2025,
-        tags: ["국어", "스토리텔링", "디지털"],
-        url: "#"
+// 전체 자료와 검색 색인 (update_materials.py가 생성)
+let searchData = [];
+let searchIndex = null;
+let searchDataReady = null;
+
+// 자료와 검색 색인 불러오기 (처음 검색할 때 한 번만)
+function loadSearchData() {
+    if (!searchDataReady) {
+        searchDataReady = Promise.all([
+            fetchDataFile('all_materials').then(response => response.json()),
+            fetchDataFile('search_index')
+                .then(response => response.ok ? response.json() : null)
+                .catch(() => null)
+        ]).then(([materials, index]) => {
+            searchData = materials;
+            // 색인이 자료와 맞지 않으면 사용하지 않고 전체 검사로 대체
+            searchIndex = index && index.count === materials.length ? index : null;
+        });
+    }
+    return searchDataReady;
+}
+
+// 검색 대상 문자열 정규화 (scripts/search_index.py의 normalize_text와 같은 규칙)
+function normalizeText(text) {
+    return String(text || '').normalize('NFC').toLowerCase();
+}
+
+// 검색어에서 색인 조회용 조각 추출 (두 글자 조각이 있으면 그것만, 없으면 한 글자 조각)
+function queryGrams(query) {
+    const bigrams = new Set();
+    for (let i = 0; i < query.length - 1; i++) {
+        const gram = query.slice(i, i + 2);
+        if (!/\s/.test(gram)) bigrams.add(gram);
+    }
+    if (bigrams.size > 0) return [...bigrams];
+    return [...new Set([...query].filter(ch => !/\s/.test(ch)))];
+}
+
+// 앞 값과의 차이로 저장된 문서 ID 목록 복원
+function decodePostings(gaps) {
+    const ids = new Array(gaps.length);
+    let previous = 0;
+    for (let i = 0; i < gaps.length; i++) {
+        previous += gaps[i];
+        ids[i] = previous;
+    }
+    return ids;
+}
+
+// 정렬된 두 ID 목록의 교집합
+function intersectPostings(a, b) {
+    const result = [];
+    let i = 0, j = 0;
+    while (i < a.length && j < b.length) {
+        if (a[i] === b[j]) {
+            result.push(a[i]);
+            i++;
+            j++;
+        } else if (a[i] < b[j]) {
+            i++;
+        } else {
+            j++;
+        }
+    }
+    return result;
+}
+
+// 자료가 검색어를 포함하는지 확인
+function matchesQuery(item, query) {
+    return normalizeText(item.title).includes(query) ||
+           normalizeText(item.institute).includes(query) ||
+           (item.tags || []).some(tag => normalizeText(tag).includes(query));
+}
+
+// 색인으로 후보 문서를 좁힌 뒤 후보만 실제로 확인
+function findMatches(query) {
+    if (!searchIndex) {
+        return searchData.filter(item => matchesQuery(item, query));
     }
-];
+    const grams = queryGrams(query);
+    const lists = [];
+    for (const gram of grams) {
+        const gaps = searchIndex.postings[gram];
+        if (!gaps) return [];
+        lists.push(gaps);
+    }
+    // 짧은 목록부터 교집합을 구해야 빠름
+    lists.sort((a, b) => a.length - b.length);
+    let candidates = decodePostings(lists[0]);
+    for (let i = 1; i < lists.length && candidates.length > 0; i++) {
+        candidates = intersectPostings(candidates, decodePostings(lists[i]));
+    }
+    return candidates.map(id => searchData[id]).filter(item => matchesQuery(item, query));
+}
 
 // 검색 함수
-function performSearch() {
-    const searchInput = document.getElementById('search-input').value.toLowerCase();
+async function performSearch() {
+    const searchInput = normalizeText(document.getElementById('search-input').value).trim();
     const resultsContainer = document.getElementById('search-results');
     
     // 검색어가 비어있으면 결과를 표시하지 않음
-    if (searchInput.trim() === '') {
+    if (searchInput === '') {
         resultsContainer.innerHTML = '<p>검색어를 입력하세요.</p>';
         return;
     }
+
+    try {
+        await loadSearchData();
+    } catch (error) {
+        console.error('자료를 불러오는 중 오류가 발생했습니다:', error);
+        resultsContainer.innerHTML = '<p>자료를 불러오는 데 실패했습니다.</p>';
+        return;
+    }
     
     // 검색 실행
-    const results = searchData.filter(item => {
-        return item.title.toLowerCase().includes(searchInput) || 
-               item.institute.toLowerCase().includes(searchInput) ||
-               item.tags.some(tag => tag.toLowerCase().includes(searchInput));
-    });
+    const results = findMatches(searchInput);
     
     // 결과 표시
     if (results.length === 0) {
@@ -0,0 +1,78 @@
+"""게시판 목록 페이지 파싱 벤치마크: 전체 파싱 vs 표만 파싱(빠른 경로)
+
+    python benchmarks/bench_parse.py
+    python benchmarks/bench_parse.py --html seoul=saved/seoul_list.html --repeat 20
+
+--html을 주지 않으면 benchmarks/fixtures.py의 연구원별 게시판 페이지를 사용함.
+두 경로의 추출 결과(제목, 링크, 날짜)가 다르면 종료 코드 1로 끝남.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fixtures import BOARD_LAYOUTS, render_board_page  # noqa: E402
+from update_materials import BoardCrawler, parse_full_page  # noqa: E402
+
+def load_crawlers():
+    with open(os.path.join(ROOT, 'data', 'institutes.json'), 'r', encoding='utf-8') as f:
+        institutes = json.load(f)
+    return {institute['id']: BoardCrawler(institute) for institute in institutes if institute.get('crawler')}
+
+# 비교용 추출 결과 (날짜 칸은 글자만)
+def extract(crawler, soup):
+    page_url = crawler.config['list_url']
+    return [(title, link, date_elem.get_text(strip=True) if date_elem is not None else None, pinned)
+            for title, link, date_elem, pinned in crawler.extract_rows(soup, page_url)]
+
+def best_time(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="게시판 파싱 벤치마크")
+    parser.add_argument("--html", action="append", default=[], metavar="ID=FILE",
+                        help="저장해 둔 게시판 페이지 (연구원 id=파일 경로, 여러 번 지정 가능)")
+    parser.add_argument("--rows", type=int, default=15, help="생성할 페이지의 게시글 수 (기본값: 15)")
+    parser.add_argument("--repeat", type=int, default=10, help="반복 횟수 (가장 빠른 값을 사용, 기본값: 10)")
+    args = parser.parse_args(argv)
+
+    crawlers = load_crawlers()
+    pages = []
+    for spec in args.html:
+        institute_id, path = spec.split('=', 1)
+        with open(path, 'r', encoding='utf-8') as f:
+            pages.append((institute_id, path, f.read()))
+    if not pages:
+        for institute_id in BOARD_LAYOUTS:
+            if institute_id in crawlers:
+                html = render_board_page(institute_id, range(args.rows, 0, -1))
+                pages.append((institute_id, 'fixture', html))
+
+    mismatches = 0
+    print(f"{'연구원':<10}{'출처':<10}{'크기(KB)':>10}{'행':>5}{'전체(ms)':>10}{'빠른(ms)':>10}{'배율':>7}  결과")
+    for institute_id, source, html in pages:
+        crawler = crawlers[institute_id]
+        full_rows = extract(crawler, parse_full_page(html))
+        fast_rows = extract(crawler, crawler.parse_page(html))
+        same = full_rows == fast_rows
+        mismatches += not same
+
+        full = best_time(lambda: extract(crawler, parse_full_page(html)), args.repeat)
+        fast = best_time(lambda: extract(crawler, crawler.parse_page(html)), args.repeat)
+        print(f"{institute_id:<10}{os.path.basename(source):<10}{len(html.encode('utf-8')) / 1024:>10.1f}{len(full_rows):>5}"
+              f"{full * 1000:>10.2f}{fast * 1000:>10.2f}{full / fast:>6.1f}x  {'동일' if same else '불일치'}")
+
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
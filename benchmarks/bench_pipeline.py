@@ -0,0 +1,280 @@
+"""로컬 게시판 서버를 상대로 update_materials.main() 전체를 실행하는 벤치마크
+
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --sizes 100 1000 --latency 0.05 --error-rate 0.1 --json bench.json
+
+기존 자료(all_materials.json) 크기를 바꿔 가며 실행하고, 전체 시간과 단계별 시간
+(load, fetch, wait, parse, dedup(근접 중복 포함), enrich, links, save), 초당 처리한 새 자료 수를 보여 줌.
+fetch는 실제 요청 시간만, wait는 같은 호스트 속도 제한과 재시도 대기 시간을 따로 더한 값.
+단계별 시간은 여러 스레드에서 걸린 시간을 합친 값이라 전체 시간보다 클 수 있음.
+새 자료 수가 예상과 다르거나, id가 겹치거나, 같은 게시판으로 (오류 없이) 다시 실행했을 때
+첫 실행에서 못 끝낸 게시판 외의 자료가 추가되면 종료 코드 1로 끝남.
+연도·권호만 다른 제목이 근접 중복으로 묶이는지도 먼저 확인함.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urljoin, urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import update_materials  # noqa: E402
+from board_server import BoardServer  # noqa: E402
+from fixtures import BOARD_LAYOUTS, make_post  # noqa: E402
+from near_duplicates import mark_near_duplicates  # noqa: E402
+from rate_limit import HostRateLimiter  # noqa: E402
+from run_report import load_run_report  # noqa: E402
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+STAGES = ['load', 'fetch', 'wait', 'parse', 'dedup', 'enrich', 'links', 'save']
+
+# 근접 중복 판정 확인용 제목 쌍 (두 번째 제목이 첫 번째의 중복으로 묶여야 하는지)
+NEAR_DUPLICATE_SAMPLES = [
+    ("2023학년도 경기도 초등학교 연구학교 운영 결과 보고서 (과학교육)",
+     "2024학년도 경기도 초등학교 연구학교 운영 결과 보고서 (과학교육)", False),
+    ("교육연구원 연구보고서 제1권 학생 맞춤형 진로교육 프로그램 개발",
+     "교육연구원 연구보고서 제2권 학생 맞춤형 진로교육 프로그램 개발", False),
+    ("2023학년도 경기도 초등학교 연구학교 운영 결과 보고서 (과학교육)",
+     "2023학년도 경기도 초등학교 연구학교 운영결과 보고서[과학교육]", True),
+]
+
+def check_near_duplicates():
+    problems = []
+    for first, second, expected in NEAR_DUPLICATE_SAMPLES:
+        materials = [{"id": "a", "title": first}, {"id": "b", "title": second}]
+        mark_near_duplicates(materials)
+        if (materials[1].get('duplicate_of') == 'a') != expected:
+            problems.append(f"근접 중복 판정 오류: {second!r} ({'중복이어야 함' if expected else '중복이 아니어야 함'})")
+    return problems
+
+# 함수 실행 시간을 단계별로 모음
+class StageTimer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.totals = dict.fromkeys(STAGES, 0.0)
+
+    def wrap(self, stage, func):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.totals[stage] += time.perf_counter() - start
+        return timed
+
+    # fetch()는 on_timing으로 알려 주는 실제 요청 시간(fetch)과 대기 시간(wait)을 나눠 더함
+    def wrap_fetch(self, func):
+        def timed(*args, on_timing=None, **kwargs):
+            def record(waited, sent):
+                with self._lock:
+                    self.totals['wait'] += waited
+                    self.totals['fetch'] += sent
+                if on_timing:
+                    on_timing(waited, sent)
+            return func(*args, on_timing=record, **kwargs)
+        return timed
+
+# update_materials의 각 단계 함수를 시간 측정 함수로 감싸고, 끝나면 원래대로 돌려놓음
+@contextlib.contextmanager
+def instrument(timer):
+    targets = [
+        (update_materials, 'load_existing_materials', 'load'),
+        (update_materials.BoardCrawler, 'parse_page', 'parse'),
+        (update_materials, 'is_new_material', 'dedup'),
+        (update_materials, 'mark_near_duplicates', 'dedup'),
+        (update_materials, 'enrich_pending_materials', 'enrich'),
+        (update_materials, 'check_material_links', 'links'),
+        (update_materials, 'compact_materials', 'save'),
+        (update_materials, 'save_search_index', 'save'),
+        (update_materials, 'save_shards', 'save'),
+        (update_materials, 'publish_data', 'save'),
+        (update_materials, 'save_feeds', 'save'),
+    ]
+    originals = [(owner, name, getattr(owner, name)) for owner, name, _ in targets]
+    originals.append((update_materials, 'fetch', update_materials.fetch))
+    try:
+        for owner, name, stage in targets:
+            setattr(owner, name, timer.wrap(stage, getattr(owner, name)))
+        update_materials.fetch = timer.wrap_fetch(update_materials.fetch)
+        yield
+    finally:
+        for owner, name, original in originals:
+            setattr(owner, name, original)
+
+def load_institutes():
+    with open(os.path.join(ROOT, 'data', 'institutes.json'), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+# 작업 폴더에 로컬 서버를 가리키는 institutes.json과 합성 기존 자료를 만듦
+def prepare_workdir(workdir, institutes, servers, size, new_per_institute):
+    bench_institutes = []
+    materials = []
+    per_institute = max(1, size // len(servers))
+    for institute in institutes:
+        server = servers.get(institute['id'])
+        if server is None:
+            bench_institutes.append({key: value for key, value in institute.items() if key != 'crawler'})
+            continue
+        real = urlsplit(institute['crawler']['list_url'])
+        list_url = f"{server.base_url}{real.path}" + (f"?{real.query}" if real.query else '')
+        bench_institute = dict(institute, crawler=dict(institute['crawler'], list_url=list_url))
+        bench_institutes.append(bench_institute)
+
+        crawler = update_materials.BoardCrawler(bench_institute)
+        href_format = BOARD_LAYOUTS[institute['id']][3]
+        server.post_count = per_institute + new_per_institute
+        # 최신 new_per_institute개를 뺀 나머지는 이미 수집한 자료로 둠
+        for number in range(1, per_institute + 1):
+            post = make_post(institute['id'], number)
+            detected_type, detected_tags = crawler.classify(post['title'])
+            materials.append({
+                "id": f"bench_{institute['id']}_{number}",
+                "title": post['title'],
+                "institute": institute['name'],
+                "type": detected_type,
+                "year": str(post['date'][0]),
+                "tags": detected_tags,
+                "url": urljoin(list_url, href_format.format(number=number)),
+                # 기존 자료는 상세 정보를 이미 받은 것으로 둠 (--enrich는 새 자료만 받도록)
+                "date": "{:04d}-{:02d}-{:02d}".format(*post['date']),
+            })
+
+    os.makedirs(os.path.join(workdir, 'data'), exist_ok=True)
+    shutil.copy(os.path.join(ROOT, 'data', 'taxonomy.json'), os.path.join(workdir, 'data', 'taxonomy.json'))
+    with open(os.path.join(workdir, 'data', 'institutes.json'), 'w', encoding='utf-8') as f:
+        json.dump(bench_institutes, f, ensure_ascii=False)
+    with open(os.path.join(workdir, 'data', 'all_materials.json'), 'w', encoding='utf-8') as f:
+        json.dump(materials, f, ensure_ascii=False)
+    return len(materials)
+
+# 모듈 전역 상태(캐시, 워터마크)를 비워 매 실행을 같은 조건에서 시작
+def reset_pipeline_state(args):
+    # 같은 호스트 요청 간격을 --host-delay로 맞춤 (0이면 사실상 제한 없음)
+    rate = 1 / args.host_delay if args.host_delay > 0 else 1e6
+    update_materials.limiter = HostRateLimiter(rate=rate)
+    update_materials.link_limiter = HostRateLimiter(rate=rate)
+    update_materials.http_cache = None
+    update_materials.crawl_state = None
+    update_materials.sessions.close()
+
+def run_once(size, args, institutes):
+    configured = [institute for institute in institutes
+                  if institute.get('crawler') and institute['id'] in BOARD_LAYOUTS]
+    servers = {
+        institute['id']: BoardServer(institute['id'], 0,
+                                     page_param=institute['crawler'].get('page_param', 'page'),
+                                     latency=args.latency, error_rate=args.error_rate, seed=args.seed).start()
+        for institute in configured
+    }
+    cwd = os.getcwd()
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            existing = prepare_workdir(workdir, institutes, servers, size, args.new)
+            os.chdir(workdir)
+            reset_pipeline_state(args)
+            timer = StageTimer()
+            output = io.StringIO()
+            start = time.perf_counter()
+            with instrument(timer), contextlib.redirect_stdout(output):
+                update_materials.main(['--workers', str(args.workers)]
+                                      + (['--enrich'] if args.enrich else [])
+                                      + (['--check-links'] if args.check_links else []))
+            wall = time.perf_counter() - start
+            traffic = {key: sum(server.stats[key] for server in servers.values())
+                       for key in ("requests", "errors", "bytes")}
+            # 새 자료는 저널에만 있을 수 있으므로 스냅샷 + 저널로 센다
+            materials = update_materials.load_existing_materials()
+            # 일부러 넣은 오류로 재시도를 다 쓴 게시판은 이번 자료를 버리므로 정상으로 끝난 게시판만 셈
+            statuses = load_run_report()['latest']['institutes']
+            completed = sum(1 for institute_id in servers if statuses[institute_id]['status'] == 'ok')
+
+            # 오류 없이 한 번 더 실행하면 앞에서 못 끝낸 게시판의 자료만 추가되어야 함 (시간 측정에는 넣지 않음)
+            for server in servers.values():
+                server.error_rate = 0.0
+            reset_pipeline_state(args)
+            with contextlib.redirect_stdout(io.StringIO()):
+                update_materials.main(['--workers', str(args.workers)])
+            second_total = len(update_materials.load_existing_materials())
+    finally:
+        os.chdir(cwd)
+        for server in servers.values():
+            server.stop()
+
+    added = len(materials) - existing
+    ids = [material.get('id') for material in materials]
+    return {
+        "size": existing,
+        "added": added,
+        "expected": args.new * completed,
+        "duplicate_ids": len(ids) - len(set(ids)),
+        "second_added": second_total - len(materials),
+        "second_expected": args.new * (len(servers) - completed),
+        "wall": wall,
+        "stages": timer.totals,
+        "items_per_second": added / wall if wall else 0.0,
+        **traffic,
+    }
+
+# 결과가 예상과 다른 점 (새 자료 수, id 중복, 두 번째 실행에서 추가된 자료)
+def check_result(result):
+    problems = []
+    if result["added"] != result["expected"]:
+        problems.append(f"새 자료 {result['added']}개 (예상 {result['expected']}개)")
+    if result["duplicate_ids"]:
+        problems.append(f"중복 id {result['duplicate_ids']}개")
+    if result["second_added"] != result["second_expected"]:
+        problems.append(f"두 번째 실행에서 {result['second_added']}개 추가 (예상 {result['second_expected']}개)")
+    return problems
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="자료 수집 파이프라인 벤치마크 (로컬 게시판 서버 사용)")
+    parser.add_argument("--sizes", type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="기존 자료 수 (기본값: 100 1000 10000 100000)")
+    parser.add_argument("--new", type=int, default=25, help="연구원마다 새로 올라온 게시글 수 (기본값: 25)")
+    parser.add_argument("--workers", type=int, default=update_materials.DEFAULT_WORKERS, help="동시 크롤링 연구원 수")
+    parser.add_argument("--latency", type=float, default=0.0, help="응답 지연 평균(초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 응답 비율 (0~1)")
+    parser.add_argument("--host-delay", type=float, default=0.0, help="같은 호스트 요청 사이 대기(초), 기본값 0")
+    parser.add_argument("--enrich", action="store_true", help="상세 페이지 정보 수집 단계까지 실행")
+    parser.add_argument("--check-links", action="store_true", help="저장된 자료의 링크 확인 단계까지 실행")
+    parser.add_argument("--seed", type=int, default=0, help="지연·오류 난수 시드")
+    parser.add_argument("--json", metavar="FILE", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args(argv)
+
+    institutes = load_institutes()
+
+    results = []
+    header = f"{'기존 자료':>10}{'새 자료':>8}{'전체(s)':>9}" + ''.join(f"{stage + '(s)':>10}" for stage in STAGES) + f"{'자료/s':>9}{'요청':>6}{'오류':>6}"
+    print(header)
+    failures = 0
+    for problem in check_near_duplicates():
+        failures += 1
+        print(f"  ! {problem}")
+    for size in args.sizes:
+        result = run_once(size, args, institutes)
+        result["problems"] = check_result(result)
+        failures += bool(result["problems"])
+        results.append(result)
+        print(f"{result['size']:>10}{result['added']:>8}{result['wall']:>9.2f}"
+              + ''.join(f"{result['stages'][stage]:>10.3f}" for stage in STAGES)
+              + f"{result['items_per_second']:>9.1f}{result['requests']:>6}{result['errors']:>6}")
+        for problem in result["problems"]:
+            print(f"  ! {problem}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({"options": vars(args), "results": results}, f, ensure_ascii=False, indent=2)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
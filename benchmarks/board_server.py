@@ -0,0 +1,89 @@
+"""실제 연구원 게시판 대신 쓰는 로컬 게시판 서버 (벤치마크·회귀 확인용)
+
+연구원마다 포트를 따로 열어 서로 다른 호스트처럼 보이게 하고,
+benchmarks/fixtures.py의 페이지를 게시글 수에 맞춰 페이지 단위로 돌려주고,
+상세 링크(게시글 번호 파라미터가 있는 주소)에는 상세 페이지를 돌려줌.
+응답 지연(latency)과 오류(error_rate, 503 응답)를 일부러 넣을 수 있음.
+"""
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from fixtures import DETAIL_KEYS, render_board_page, render_detail_page
+
+PAGE_SIZE = 10
+
+class BoardServer:
+    def __init__(self, institute_id, post_count, page_param='page', latency=0.0, error_rate=0.0, seed=0):
+        self.institute_id = institute_id
+        self.post_count = post_count
+        self.page_param = page_param
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rng = random.Random(f"{seed}-{institute_id}")
+        self.stats = {"requests": 0, "errors": 0, "bytes": 0}
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    # 최신 글이 가장 큰 번호, 1페이지에 최신 글
+    def page_numbers(self, page):
+        first = self.post_count - (page - 1) * PAGE_SIZE
+        return range(first, max(first - PAGE_SIZE, 0), -1)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                query = dict(parse_qsl(urlsplit(self.path).query))
+                try:
+                    page = max(1, int(query.get(server.page_param, 1)))
+                except ValueError:
+                    page = 1
+                with server._lock:
+                    server.stats["requests"] += 1
+                    fail = server.rng.random() < server.error_rate
+                    delay = server.latency * (0.5 + server.rng.random()) if server.latency else 0
+                if delay:
+                    time.sleep(delay)
+                if fail:
+                    with server._lock:
+                        server.stats["errors"] += 1
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                detail_number = next((query[key] for key in DETAIL_KEYS if key in query), None)
+                if detail_number is not None and detail_number.isdigit():
+                    body = render_detail_page(server.institute_id, int(detail_number)).encode('utf-8')
+                else:
+                    total_pages = max(1, -(-server.post_count // PAGE_SIZE))
+                    body = render_board_page(server.institute_id, server.page_numbers(page), page, total_pages).encode('utf-8')
+                with server._lock:
+                    server.stats["bytes"] += len(body)
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,111 @@
+import random
+
+# 벤치마크용 게시판 페이지 (연구원별 실제 게시판과 같은 구조의 표 + 무거운 포털 머리말/꼬리말)
+# 표 구조는 data/institutes.json의 crawler 선택자와 맞춰 둠
+
+SUBJECTS = ["국어", "수학", "과학", "사회", "영어", "정보", "진로", "음악", "미술", "체육"]
+TOPICS = ["AI 활용", "미래교육", "교육과정 개정", "창의 융합", "환경 교육", "디지털 전환",
+          "탐구 학습", "교원 연수", "학생 평가", "기초학력"]
+KINDS = ["연구보고서", "수업지도안", "수업자료", "정책연구", "탐구보고서", "교수학습자료"]
+
+# 게시글 번호로 항상 같은 제목·날짜를 만듦
+def make_post(institute_id, number):
+    rng = random.Random(f"{institute_id}-{number}")
+    title = f"{rng.choice(TOPICS)} {rng.choice(SUBJECTS)} {rng.choice(KINDS)} {number}호"
+    year = 2015 + number % 11
+    return {
+        "number": number,
+        "title": title,
+        "date": (year, 1 + number % 12, 1 + number % 28),
+    }
+
+def _row_seoul(post, href):
+    y, m, d = post["date"]
+    return (f'<tr><td class="num">{post["number"]}</td><td class="subject"><a href="{href}">{post["title"]}</a></td>'
+            f'<td class="writer">연구정보원</td><td class="date">{y}.{m:02d}.{d:02d}</td><td class="hit">{post["number"] % 97}</td></tr>')
+
+def _row_busan(post, href):
+    y, m, d = post["date"]
+    return (f'<tr><td class="td_num">{post["number"]}</td><td class="subject"><a href="{href}">{post["title"]}</a></td>'
+            f'<td class="td_name">관리자</td><td class="datetime">{y}-{m:02d}-{d:02d}</td></tr>')
+
+def _row_daegu(post, href):
+    y, m, d = post["date"]
+    return (f'<tr><td>{post["number"]}</td><td class="title"><a href="{href}">{post["title"]}</a></td>'
+            f'<td>담당자</td><td class="reg_dt">{y}-{m:02d}-{d:02d}</td></tr>')
+
+def _row_incheon(post, href):
+    y, m, d = post["date"]
+    return (f'<tr><td>{post["number"]}</td><td class="tit"><a href="{href}">{post["title"]}</a></td>'
+            f'<td class="date">{y}.{m:02d}.{d:02d}</td><td>{post["number"] % 50}</td></tr>')
+
+def _row_gwangju(post, href):
+    y, m, d = post["date"]
+    return (f'<tr><td>{post["number"]}</td><td class="subject"><a href="{href}">{post["title"]}</a></td>'
+            f'<td class="reg_dt">{y}-{m:02d}-{d:02d}</td></tr>')
+
+# 연구원별 (행 생성 함수, 표 열기, 표 닫기, 상세 링크 형식)
+BOARD_LAYOUTS = {
+    "seoul": (_row_seoul,
+              '<div class="board_wrap"><table class="board-list"><thead><tr><th>번호</th><th>제목</th><th>작성자</th><th>등록일</th><th>조회</th></tr></thead><tbody>',
+              '</tbody></table></div>',
+              "view0010v.do?nttId={number}"),
+    "busan": (_row_busan,
+              '<div class="tbl_head01"><table class="board_list"><tr><th>번호</th><th>제목</th><th>글쓴이</th><th>날짜</th></tr>',
+              '</table></div>',
+              "/bbs/board.php?bo_table=data&wr_id={number}"),
+    "daegu": (_row_daegu,
+              '<table class="board_list"><thead><tr><th>번호</th><th>제목</th><th>작성자</th><th>등록일</th></tr></thead><tbody>',
+              '</tbody></table>',
+              "/board/view.do?boardId=BBS_0000008&dataSid={number}"),
+    "incheon": (_row_incheon,
+                '<table class="board_type01"><thead><tr><th>번호</th><th>제목</th><th>등록일</th><th>조회</th></tr></thead><tbody>',
+                '</tbody></table>',
+                "/boardCnts/view.do?boardID=1624&boardSeq={number}&m=0301&s=ice"),
+    "gwangju": (_row_gwangju,
+                '<table class="board_list"><thead><tr><th>번호</th><th>제목</th><th>등록일</th></tr></thead><tbody>',
+                '</tbody></table>',
+                "/cop/bbs/selectBoardArticle.do?bbsId=BBSMSTR_000000000101&nttId={number}"),
+}
+
+# 정부 포털 페이지처럼 큰 메뉴, 배너, 스크립트, 꼬리말을 붙임
+def portal_chrome(institute_id, menu_size=400):
+    rng = random.Random(institute_id)
+    menu = ''.join(
+        f'<li class="depth2"><a href="/menu/{i}.do" title="{rng.choice(TOPICS)}">{rng.choice(SUBJECTS)} 메뉴 {i}</a>'
+        f'<ul class="depth3"><li><a href="/menu/{i}/1.do">하위 메뉴 1</a></li><li><a href="/menu/{i}/2.do">하위 메뉴 2</a></li></ul></li>'
+        for i in range(menu_size)
+    )
+    script = '<script>' + ''.join(f'var cfg{i} = {{"id": {i}, "name": "menu{i}"}};' for i in range(menu_size)) + '</script>'
+    header = (f'<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8"><title>{institute_id} 자료실</title>{script}</head>'
+              f'<body><div id="skip"><a href="#content">본문 바로가기</a></div><header><nav id="gnb"><ul>{menu}</ul></nav></header>'
+              f'<div id="container"><aside id="lnb"><ul>{menu[:len(menu) // 4]}</ul></aside><div id="content">')
+    footer = ('</div></div><footer><ul class="family_site">'
+              + ''.join(f'<li><a href="https://site{i}.go.kr">관련 사이트 {i}</a></li>' for i in range(menu_size // 4))
+              + '</ul><address>교육청 연구원</address></footer></body></html>')
+    return header, footer
+
+# 게시판 목록 페이지 HTML 생성 (numbers: 이 페이지에 보일 게시글 번호 목록)
+def render_board_page(institute_id, numbers, page=1, total_pages=1):
+    row, table_open, table_close, href_format = BOARD_LAYOUTS[institute_id]
+    header, footer = portal_chrome(institute_id)
+    rows = ''.join(row(make_post(institute_id, number), href_format.format(number=number)) for number in numbers)
+    paging = ''.join(f'<a href="?page={p}">{p}</a>' for p in range(1, min(total_pages, 10) + 1))
+    return f'{header}<h2>자료실</h2>{table_open}{rows}{table_close}<div class="paging">{paging}</div>{footer}'
+
+# 상세 페이지의 번호 파라미터 (BOARD_LAYOUTS의 상세 링크 형식과 맞춤)
+DETAIL_KEYS = ("nttId", "wr_id", "dataSid", "boardSeq")
+GRADES = ["초등학교", "중학교", "고등학교"]
+
+# 게시글 상세 페이지 HTML 생성 (본문, 등록일, 첨부파일 포함)
+def render_detail_page(institute_id, number):
+    post = make_post(institute_id, number)
+    header, footer = portal_chrome(institute_id, menu_size=100)
+    y, m, d = post["date"]
+    grade = GRADES[number % len(GRADES)]
+    body = (f'<div class="board_view"><h3>{post["title"]}</h3>'
+            f'<div class="view_info"><span>작성자 연구원</span><span>등록일 {y}-{m:02d}-{d:02d}</span></div>'
+            f'<div class="view_content"><p>{grade} 학생을 대상으로 한 자료입니다.</p></div>'
+            f'<div class="file"><a href="/files/{institute_id}/{number}.pdf">{post["title"]}.pdf</a>'
+            f'<a href="/files/{institute_id}/{number}.hwp">{post["title"]}.hwp</a></div></div>')
+    return f'{header}{body}{footer}'
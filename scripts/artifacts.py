@@ -0,0 +1,76 @@
+import gzip
+import json
+import os
+from datetime import datetime
+
+from shards import content_hash, dump_compact
+from storage import write_atomic, write_json_atomic
+
+# brotli는 선택 사항 (설치되어 있지 않으면 .br 파일은 만들지 않음)
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# 내용 해시가 붙은 배포용 파일을 두는 폴더와, 현재 버전을 가리키는 작은 목록 파일
+# 페이지는 current.json만 매번 확인하고, 해시가 붙은 파일은 내용이 바뀌지 않으므로 계속 캐시해도 됨
+ARTIFACT_DIR = 'data/dist'
+POINTER_FILE = 'data/current.json'
+POINTER_VERSION = 1
+
+def _compressed_variants(data):
+    variants = {"gzip": ('.gz', gzip.compress(data, compresslevel=9, mtime=0))}
+    if brotli is not None:
+        variants["br"] = ('.br', brotli.compress(data, quality=11))
+    return variants
+
+def load_pointer(path=POINTER_FILE):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+# 목록 파일에 적힌 파일 경로들 (data/ 기준)
+def _pointer_files(pointer):
+    files = set()
+    for entry in pointer.get("files", {}).values():
+        files.add(entry["file"])
+        files.update(variant["file"] for variant in entry.get("encodings", {}).values())
+    return files
+
+# 배포용 파일 저장: 이름마다 공백 없는 JSON과 압축본(.gz, .br)을 내용 해시가 붙은 이름으로 쓰고 목록 파일 갱신
+# 같은 내용이면 같은 파일 이름이라 다시 쓰지 않음. 바로 이전 버전 파일은 남겨 두고 그보다 오래된 파일은 삭제
+def publish_artifacts(artifacts, artifact_dir=ARTIFACT_DIR, pointer_path=POINTER_FILE):
+    base_dir = os.path.dirname(pointer_path) or '.'
+    previous = load_pointer(pointer_path)
+    pointer = {
+        "version": POINTER_VERSION,
+        "generated": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        "files": {},
+    }
+    os.makedirs(artifact_dir, exist_ok=True)
+    prefix = os.path.relpath(artifact_dir, base_dir).replace(os.sep, '/')
+
+    for name, value in artifacts.items():
+        data = dump_compact(value)
+        digest = content_hash(data)
+        file_name = f"{name}.{digest}.json"
+        entry = {"file": f"{prefix}/{file_name}", "hash": digest, "bytes": len(data), "encodings": {}}
+        path = os.path.join(artifact_dir, file_name)
+        if not os.path.exists(path):
+            write_atomic(path, data)
+        for encoding, (suffix, compressed) in _compressed_variants(data).items():
+            if not os.path.exists(path + suffix):
+                write_atomic(path + suffix, compressed)
+            entry["encodings"][encoding] = {"file": entry["file"] + suffix, "bytes": len(compressed)}
+        pointer["files"][name] = entry
+
+    # 목록 파일을 먼저 바꾼 뒤 예전 파일을 지움 (목록이 가리키는 파일이 없는 순간이 생기지 않게)
+    write_json_atomic(pointer_path, pointer)
+    keep = _pointer_files(pointer) | _pointer_files(previous)
+    for file_name in os.listdir(artifact_dir):
+        relative_path = f"{prefix}/{file_name}"
+        if relative_path not in keep and not file_name.startswith('.'):
+            os.remove(os.path.join(artifact_dir, file_name))
+    return pointer
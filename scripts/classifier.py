@@ -0,0 +1,141 @@
+import json
+from collections import deque
+
+# 공통 태그 어휘와 자료 유형 규칙
+TAXONOMY_FILE = 'data/taxonomy.json'
+
+# 여러 키워드를 한 번에 찾는 Aho-Corasick 오토마톤
+# 제목 길이에 비례하는 한 번의 훑기로 모든 키워드 일치를 찾음
+class KeywordAutomaton:
+    def __init__(self, patterns):
+        # patterns: {키워드: [결과값, ...]}
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        # 상태마다 (키워드 길이, 결과값): 일치한 위치를 알아야 할 때 사용
+        self.spans = [[]]
+        for pattern, payloads in patterns.items():
+            if pattern:
+                self._add(pattern, payloads)
+        self._build_failure_links()
+
+    def _add(self, pattern, payloads):
+        state = 0
+        for ch in pattern:
+            next_state = self.goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][ch] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+                self.spans.append([])
+            state = next_state
+        self.output[state].extend(payloads)
+        self.spans[state].extend((len(pattern), payload) for payload in payloads)
+
+    def _build_failure_links(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(ch, 0)
+                # 실패 링크 쪽에서 끝나는 키워드도 함께 보고
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+                self.spans[next_state] = self.spans[next_state] + self.spans[self.fail[next_state]]
+
+    # 본문에서 일치한 키워드의 결과값을 차례로 돌려줌
+    def iter_matches(self, text):
+        state = 0
+        goto, fail, output = self.goto, self.fail, self.output
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if output[state]:
+                yield from output[state]
+
+    # 일치한 키워드마다 (본문에서 시작 위치, 결과값)을 돌려줌
+    def iter_spans(self, text):
+        state = 0
+        goto, fail, spans = self.goto, self.fail, self.spans
+        for end, ch in enumerate(text, 1):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, payload in spans[state]:
+                yield end - length, payload
+
+# 제목으로 자료 유형과 태그를 정하는 분류기
+class Classifier:
+    def __init__(self, tags=None, type_rules=None):
+        # tags: {태그: [키워드, ...]}, type_rules: [(유형, [키워드, ...]), ...] (앞쪽 규칙이 우선)
+        tags = tags or {}
+        type_rules = type_rules or []
+        self.tag_order = list(tags)
+        self.type_order = [rule_type for rule_type, _ in type_rules]
+        patterns = {}
+        for tag, keywords in tags.items():
+            for keyword in keywords:
+                patterns.setdefault(keyword, []).append(('tag', tag))
+        for rule_type, keywords in type_rules:
+            for keyword in keywords:
+                patterns.setdefault(keyword, []).append(('type', rule_type))
+        self.automaton = KeywordAutomaton(patterns)
+
+    @property
+    def tag_labels(self):
+        return set(self.tag_order)
+
+    # (규칙에 걸린 유형 또는 None, 어휘 순서대로 정렬된 태그 목록)
+    def classify(self, title):
+        found_tags = set()
+        found_types = set()
+        for kind, label in self.automaton.iter_matches(title or ''):
+            if kind == 'tag':
+                found_tags.add(label)
+            else:
+                found_types.add(label)
+        detected_type = next((rule_type for rule_type in self.type_order if rule_type in found_types), None)
+        return detected_type, [tag for tag in self.tag_order if tag in found_tags]
+
+    # 본문에서 가장 먼저 나온 태그 (같은 위치에서 시작하면 어휘 순서가 앞선 태그, 없으면 None)
+    def first_tag(self, text):
+        first = None
+        for start, (kind, label) in self.automaton.iter_spans(text or ''):
+            if kind != 'tag':
+                continue
+            key = (start, self.tag_order.index(label))
+            if first is None or key < first[0]:
+                first = (key, label)
+        return first[1] if first else None
+
+def load_taxonomy(path=TAXONOMY_FILE):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+# 공통 어휘에 연구원별 추가 키워드를 더해 분류기 생성
+# extra_keywords: 키워드 자체를 태그로 쓰는 추가 어휘, extra_type_keywords: {유형: [키워드, ...]}
+def build_classifier(taxonomy, extra_keywords=(), extra_type_keywords=None):
+    tags = {tag: list(keywords) for tag, keywords in taxonomy.get('tags', {}).items()}
+    for keyword in extra_keywords:
+        tags.setdefault(keyword, [])
+        if keyword not in tags[keyword]:
+            tags[keyword].append(keyword)
+
+    type_rules = [(rule['type'], list(rule['keywords'])) for rule in taxonomy.get('type_rules', [])]
+    for rule_type, keywords in (extra_type_keywords or {}).items():
+        for existing_type, existing_keywords in type_rules:
+            if existing_type == rule_type:
+                existing_keywords.extend(keyword for keyword in keywords if keyword not in existing_keywords)
+                break
+        else:
+            type_rules.append((rule_type, list(keywords)))
+    return Classifier(tags, type_rules)
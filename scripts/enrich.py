@@ -0,0 +1,179 @@
+import json
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlsplit
+
+import soupsieve
+from bs4 import BeautifulSoup
+
+from classifier import Classifier
+from rate_limit import TimeBudgetExceeded
+from storage import write_json_atomic
+
+# 상세 페이지에서 뽑은 정보를 URL별로 보관하는 파일
+DETAIL_CACHE_FILE = '.cache/detail_cache.json'
+DEFAULT_ENRICH_WORKERS = 4
+# 한 호스트에 동시에 보내는 상세 페이지 요청 수
+DEFAULT_HOST_LIMIT = 2
+# 실행 시간 예산이 이만큼(초) 남으면 새 상세 페이지 요청을 시작하지 않음 (링크 확인·저장할 시간을 남겨 둠)
+ENRICH_RESERVE = 60
+# 상세 정보가 채워졌는지 볼 항목 (하나도 없고 캐시에도 없으면 아직 수집하지 못한 자료)
+DETAIL_FIELDS = ('subject', 'grade', 'date', 'attachments')
+
+# 상세 페이지 기본 설정 (institutes.json의 "crawler" > "detail" 항목에서 덮어씀)
+DEFAULT_DETAIL_CONFIG = {
+    "content_selectors": [".board_view", ".view_content", ".bbs_view", "#bo_v", ".view", "#content"],
+    "date_selectors": [".date", ".reg_dt", ".datetime", ".view_info", ".info"],
+    "attachment_selectors": [".file a[href]", ".attach a[href]", ".view_file a[href]", "#bo_v_file a[href]"],
+}
+# 첨부파일로 볼 링크 (확장자 또는 내려받기 주소)
+ATTACHMENT_PATTERN = re.compile(r'\.(pdf|hwp|hwpx|docx?|xlsx?|pptx?|zip)(\?|$)|download|fileDown|FileDown|atchFile', re.I)
+DATE_PATTERN = re.compile(r'(20\d{2}|19\d{2})[.\-/년]\s*(\d{1,2})[.\-/월]\s*(\d{1,2})')
+DATE_LABEL_PATTERN = re.compile(r'(등록일|작성일|게시일|발행일)\s*[:：]?\s*')
+
+def _compile(selectors):
+    return [soupsieve.compile(selector) for selector in selectors]
+
+def _select_first(selectors, node):
+    for selector in selectors:
+        found = selector.select_one(node)
+        if found is not None:
+            return found
+    return None
+
+# 상세 페이지 한 종류(연구원)에 대한 파서. 선택자와 교과·학년 분류기는 한 번만 만듦
+class DetailParser:
+    def __init__(self, taxonomy, config=None):
+        config = {**DEFAULT_DETAIL_CONFIG, **(config or {})}
+        self.content_selectors = _compile(config['content_selectors'])
+        self.date_selectors = _compile(config['date_selectors'])
+        self.attachment_selectors = _compile(config['attachment_selectors'])
+        self.subjects = Classifier(taxonomy.get('subjects', {}))
+        self.grades = Classifier(taxonomy.get('grades', {}))
+
+    # 제목에서 먼저 찾고, 없으면 본문에서 찾음 (각 글에서 가장 먼저 나온 값)
+    @staticmethod
+    def _first_label(classifier, *texts):
+        for text in texts:
+            label = classifier.first_tag(text)
+            if label:
+                return label
+        return None
+
+    def find_date(self, content, content_text):
+        date_elem = _select_first(self.date_selectors, content)
+        candidates = [date_elem.get_text(' ', strip=True)] if date_elem is not None else []
+        label = DATE_LABEL_PATTERN.search(content_text)
+        if label:
+            candidates.append(content_text[label.end():label.end() + 40])
+        for text in candidates:
+            match = DATE_PATTERN.search(text)
+            if match:
+                year, month, day = (int(part) for part in match.groups())
+                return f"{year:04d}-{month:02d}-{day:02d}"
+        return None
+
+    def find_attachments(self, soup, page_url):
+        links = []
+        for selector in self.attachment_selectors:
+            links.extend(selector.select(soup))
+        if not links:
+            links = [link for link in soup.find_all('a', href=True) if ATTACHMENT_PATTERN.search(link['href'])]
+        urls = []
+        for link in links:
+            href = link.get('href', '').strip()
+            if href and not href.startswith(('javascript:', '#', 'mailto:')):
+                urls.append(urljoin(page_url, href))
+        return list(dict.fromkeys(urls))
+
+    # 상세 페이지에서 교과, 학년, 발행일, 첨부파일 추출 (찾은 값만 돌려줌)
+    def parse(self, html, page_url, title=''):
+        soup = BeautifulSoup(html, 'lxml')
+        content = _select_first(self.content_selectors, soup)
+        # 본문을 찾지 못하면 교과·학년은 제목으로만 정함 (메뉴·사이드바 글자에서 잘못 뽑지 않도록)
+        content_texts = [content.get_text(' ', strip=True)] if content is not None else []
+        page = content if content is not None else soup
+        details = {
+            "subject": self._first_label(self.subjects, title, *content_texts),
+            "grade": self._first_label(self.grades, title, *content_texts),
+            "date": self.find_date(page, page.get_text(' ', strip=True)),
+            "attachments": self.find_attachments(page, page_url) or self.find_attachments(soup, page_url),
+        }
+        return {key: value for key, value in details.items() if value}
+
+# URL별 상세 정보 캐시 (한 번 뽑은 자료는 다시 요청하지 않음)
+class DetailCache:
+    def __init__(self, path=DETAIL_CACHE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self.entries = {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+    def get(self, url):
+        with self._lock:
+            return self.entries.get(url)
+
+    def put(self, url, details):
+        with self._lock:
+            self.entries[url] = details
+
+    def save(self):
+        with self._lock:
+            entries = dict(self.entries)
+        write_json_atomic(self.path, entries)
+
+# 상세 정보를 아직 받지 못한 자료 (지난 실행에서 요청이 실패했거나 시간 예산이 모자랐던 자료)
+def needs_details(material, cache):
+    return (bool(material.get('url')) and not any(material.get(field) for field in DETAIL_FIELDS)
+            and cache.get(material['url']) is None)
+
+# 자료의 상세 페이지를 제한된 수의 작업자로 받아 정보를 채움
+# fetch(url)는 응답을 돌려주는 함수, parser_for(material)는 해당 자료의 DetailParser
+# budget이 있으면 남은 시간이 reserve초 이하일 때 남은 자료는 다음 실행으로 미룸
+def enrich_materials(materials, fetch, parser_for, cache, workers=DEFAULT_ENRICH_WORKERS,
+                     host_limit=DEFAULT_HOST_LIMIT, on_error=None, budget=None, reserve=0):
+    stats = {"cached": 0, "fetched": 0, "failed": 0, "deferred": 0}
+    stats_lock = threading.Lock()
+    host_slots = {}
+
+    def slot(url):
+        host = urlsplit(url).netloc
+        with stats_lock:
+            return host_slots.setdefault(host, threading.Semaphore(max(1, host_limit)))
+
+    def enrich_one(material):
+        url = material['url']
+        details = cache.get(url)
+        if details is not None:
+            outcome = "cached"
+        elif budget is not None and budget.remaining() <= reserve:
+            outcome = "deferred"
+        else:
+            try:
+                with slot(url):
+                    response = fetch(url)
+                response.raise_for_status()
+                details = parser_for(material).parse(response.text, url, material.get('title', ''))
+                cache.put(url, details)
+                outcome = "fetched"
+            except TimeBudgetExceeded:
+                outcome = "deferred"
+            except Exception as e:
+                if on_error:
+                    on_error(material, e)
+                with stats_lock:
+                    stats["failed"] += 1
+                return
+        if details:
+            material.update(details)
+        with stats_lock:
+            stats[outcome] += 1
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        list(executor.map(enrich_one, [material for material in materials if material.get('url')]))
+    return stats
@@ -0,0 +1,102 @@
+import json
+import os
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+from storage import write_atomic, write_json_atomic
+
+# 실행마다 새로 추가된 자료만 담는 파일(delta)과 그 목록, 최근 추가 자료 창(recent.json)과 Atom 피드
+# 전체 자료 파일은 다시 읽지 않고, 이번 실행의 새 자료와 작은 recent.json만으로 만듦
+DELTA_DIR = 'data/deltas'
+DELTA_INDEX_FILE = 'data/deltas/index.json'
+RECENT_FILE = 'data/recent.json'
+FEED_FILE = 'data/feed.xml'
+# 보관할 delta 파일 수 (매주 실행 기준 약 1년)와 recent.json·피드에 담을 최근 자료 수
+DELTA_HISTORY_LIMIT = 52
+RECENT_LIMIT = 100
+
+SITE_URL = 'https://eduresearchinstitude.github.io/'
+FEED_TITLE = '전국 교육(과학)연구원 자료 허브 - 새 자료'
+ATOM_NS = 'http://www.w3.org/2005/Atom'
+
+def _load_json(path, default):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return default
+
+# 이번 실행의 delta 파일을 쓰고 delta 목록 갱신 (오래된 delta 파일은 삭제)
+def save_delta(new_materials, run_time, delta_dir=DELTA_DIR, index_path=DELTA_INDEX_FILE,
+               history_limit=DELTA_HISTORY_LIMIT):
+    index = _load_json(index_path, {})
+    runs = list(index.get("runs", []))
+    run_id = run_time.strftime('%Y%m%d-%H%M%S')
+    file_name = f"{run_id}.json"
+    write_json_atomic(os.path.join(delta_dir, file_name), {
+        "run": run_id,
+        "generated": run_time.isoformat(timespec='seconds'),
+        "since": runs[0]["run"] if runs else None,
+        "count": len(new_materials),
+        "items": new_materials,
+    }, compact=True)
+
+    runs.insert(0, {"run": run_id, "file": file_name, "count": len(new_materials)})
+    kept, dropped = runs[:history_limit], runs[history_limit:]
+    for entry in dropped:
+        try:
+            os.remove(os.path.join(delta_dir, entry["file"]))
+        except FileNotFoundError:
+            pass
+    index = {"latest": run_id, "runs": kept}
+    write_json_atomic(index_path, index)
+    return index
+
+# 최근 추가 자료 창 갱신 (새 자료를 앞에 붙이고 recent_limit개만 남김)
+def update_recent(new_materials, run_time, path=RECENT_FILE, recent_limit=RECENT_LIMIT):
+    added = run_time.isoformat(timespec='seconds')
+    items = [dict(material, added=added) for material in new_materials]
+    items.extend(_load_json(path, {}).get("items", []))
+    recent = {"updated": added, "items": items[:recent_limit]}
+    write_json_atomic(path, recent)
+    return recent
+
+def _text(parent, tag, text, **attrs):
+    elem = ET.SubElement(parent, f"{{{ATOM_NS}}}{tag}", attrs)
+    if text is not None:
+        elem.text = text
+    return elem
+
+# recent.json 내용으로 Atom 피드 작성
+def build_atom_feed(recent, site_url=SITE_URL, title=FEED_TITLE):
+    ET.register_namespace('', ATOM_NS)
+    feed = ET.Element(f"{{{ATOM_NS}}}feed")
+    _text(feed, 'id', site_url)
+    _text(feed, 'title', title)
+    _text(feed, 'updated', recent.get("updated") or datetime.now().astimezone().isoformat(timespec='seconds'))
+    _text(feed, 'link', None, href=site_url)
+    _text(feed, 'link', None, rel='self', href=site_url + FEED_FILE)
+    for item in recent.get("items", []):
+        entry = _text(feed, 'entry', None)
+        _text(entry, 'id', item.get('url') or f"{site_url}#{item.get('id')}")
+        _text(entry, 'title', item.get('title'))
+        _text(entry, 'updated', item.get('added'))
+        if item.get('url'):
+            _text(entry, 'link', None, href=item['url'])
+        author = _text(entry, 'author', None)
+        _text(author, 'name', item.get('institute'))
+        _text(entry, 'summary', ' · '.join(str(part) for part in (item.get('institute'), item.get('type'), item.get('year')) if part))
+        for tag in item.get('tags', []):
+            _text(entry, 'category', None, term=str(tag))
+    return ET.tostring(feed, encoding='utf-8', xml_declaration=True)
+
+# 이번 실행에서 추가된 자료의 delta 파일, recent.json, Atom 피드 저장 (새 자료가 없으면 아무것도 쓰지 않음)
+def save_feeds(new_materials, run_time=None, feed_path=FEED_FILE):
+    new_materials = list(new_materials)
+    if not new_materials:
+        return None
+    run_time = (run_time or datetime.now()).astimezone()
+    save_delta(new_materials, run_time)
+    recent = update_recent(new_materials, run_time)
+    write_atomic(feed_path, build_atom_feed(recent))
+    return recent
@@ -0,0 +1,91 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from itertools import chain, zip_longest
+from urllib.parse import urlsplit
+
+from rate_limit import TimeBudgetExceeded
+
+DEFAULT_LINK_WORKERS = 8
+# 한 호스트에 동시에 보내는 링크 확인 요청 수
+DEFAULT_LINK_HOST_LIMIT = 2
+# 마지막 확인 후 이 일수가 지난 링크만 다시 확인
+DEFAULT_LINK_MAX_AGE_DAYS = 30
+# 실행 시간 예산이 이만큼(초) 남으면 새 확인을 시작하지 않음 (저장할 시간을 남겨 둠)
+LINK_CHECK_RESERVE = 60
+# HEAD를 지원하지 않는 서버가 많아 이 응답이면 GET으로 다시 확인
+HEAD_FALLBACK_STATUSES = {400, 403, 404, 405, 501}
+# 응답을 받지 못한 링크의 status 값
+UNREACHABLE = "unreachable"
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# 마지막 확인에서 오류 응답을 받았거나 접속하지 못한 자료
+def is_broken(material):
+    status = material.get('status')
+    return status == UNREACHABLE or (isinstance(status, int) and status >= 400)
+
+# 다시 확인할 때가 된 자료 (확인한 적 없는 자료 먼저, 그다음 오래전에 확인한 순서)
+def links_due(materials, max_age_days=DEFAULT_LINK_MAX_AGE_DAYS, now=None):
+    cutoff = ((now or datetime.now()) - timedelta(days=max_age_days)).strftime(TIME_FORMAT)
+    due = [material for material in materials
+           if material.get('url') and (material.get('last_checked') or '') <= cutoff]
+    due.sort(key=lambda material: material.get('last_checked') or '')
+    return due
+
+# 호스트를 번갈아 가며 나열 (한 호스트의 링크가 몰려 작업자가 모두 같은 호스트 차례를 기다리지 않게 함)
+def interleave_hosts(urls):
+    by_host = {}
+    for url in urls:
+        by_host.setdefault(urlsplit(url).netloc, []).append(url)
+    return [url for url in chain.from_iterable(zip_longest(*by_host.values())) if url is not None]
+
+# HEAD로 확인하고, HEAD를 거부하는 서버면 GET으로 다시 확인해 최종 응답 코드를 돌려줌
+# head(url), get(url)은 응답을 돌려주는 함수
+def link_status(url, head, get):
+    response = head(url)
+    if response.status_code in HEAD_FALLBACK_STATUSES:
+        response = get(url)
+    return response.status_code
+
+# 자료 URL을 제한된 수의 작업자로 확인해 status(응답 코드)와 last_checked 기록
+# 같은 URL을 가진 자료는 한 번만 요청하고, 시간 예산이 모자라면 남은 자료는 다음 실행으로 미룸
+def check_links(materials, head, get, budget, workers=DEFAULT_LINK_WORKERS,
+                host_limit=DEFAULT_LINK_HOST_LIMIT, reserve=LINK_CHECK_RESERVE, on_error=None):
+    stats = {"ok": 0, "broken": 0, "unreachable": 0, "deferred": 0}
+    stats_lock = threading.Lock()
+    host_slots = {}
+    by_url = {}
+    for material in materials:
+        by_url.setdefault(material['url'], []).append(material)
+
+    def slot(url):
+        host = urlsplit(url).netloc
+        with stats_lock:
+            return host_slots.setdefault(host, threading.Semaphore(max(1, host_limit)))
+
+    def check_one(url):
+        if budget.remaining() <= reserve:
+            outcome = "deferred"
+        else:
+            try:
+                with slot(url):
+                    status = link_status(url, head, get)
+                outcome = "ok" if status < 400 else "broken"
+            except TimeBudgetExceeded:
+                outcome = "deferred"
+            except Exception as e:
+                if on_error:
+                    on_error(url, e)
+                status = UNREACHABLE
+                outcome = "unreachable"
+            if outcome != "deferred":
+                checked = datetime.now().strftime(TIME_FORMAT)
+                for material in by_url[url]:
+                    material['status'] = status
+                    material['last_checked'] = checked
+        with stats_lock:
+            stats[outcome] += len(by_url[url])
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        list(executor.map(check_one, interleave_hosts(by_url)))
+    return stats
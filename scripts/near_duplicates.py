@@ -0,0 +1,127 @@
+import hashlib
+import re
+import struct
+import unicodedata
+from collections import Counter
+
+# 제목 유사도 판단 기준 (글자 3개 조각 집합의 자카드 유사도)
+SHINGLE_SIZE = 3
+SIMILARITY_THRESHOLD = 0.8
+# MinHash 해시 수 = 밴드 수 x 밴드당 행 수 (8 x 4: 유사도 약 0.6 이상이면 후보가 됨)
+LSH_BANDS = 8
+LSH_ROWS = 4
+# 한 자료에서 실제로 유사도를 계산해 볼 최대 후보 수 (겹치는 밴드가 많은 후보부터)
+MAX_CANDIDATES = 8
+# 버킷 하나에 넣을 최대 자료 수 (흔한 틀의 제목이 몰린 버킷이 끝없이 커지지 않게 함)
+MAX_BUCKET_SIZE = 64
+
+# 괄호, 기호, 공백을 모두 없애고 한글·영문·숫자만 남김
+def normalize_title(title):
+    text = unicodedata.normalize('NFC', str(title or '')).lower()
+    return re.sub(r'[^0-9a-z가-힣]+', '', text)
+
+# 정규화한 제목의 글자 조각 집합 (제목이 짧으면 제목 전체를 한 조각으로)
+def title_shingles(title, size=SHINGLE_SIZE):
+    text = normalize_title(title)
+    if len(text) <= size:
+        return frozenset([text]) if text else frozenset()
+    return frozenset(text[i:i + size] for i in range(len(text) - size + 1))
+
+# 제목의 숫자 묶음 (연도, 제N권, N호 등). 숫자가 다른 제목은 연속 간행물의 다른 호로 보고 묶지 않음
+def title_numbers(title):
+    return tuple(re.findall(r'[0-9]+', normalize_title(title)))
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    common = len(a & b)
+    return common / (len(a) + len(b) - common)
+
+# 제목 근접 중복 색인 (MinHash + LSH)
+# 자료를 하나씩 추가하면서 같은 밴드 값을 가진 후보만 비교하므로 전체 비교 없이 선형 시간에 가까움
+class NearDuplicateIndex:
+    def __init__(self, bands=LSH_BANDS, rows=LSH_ROWS, threshold=SIMILARITY_THRESHOLD,
+                 max_candidates=MAX_CANDIDATES, max_bucket_size=MAX_BUCKET_SIZE):
+        self.bands = bands
+        self.rows = rows
+        self.threshold = threshold
+        self.max_candidates = max_candidates
+        self.max_bucket_size = max_bucket_size
+        # blake2b 해시 하나(64바이트)를 16비트씩 잘라 해시 함수 32개 값으로 사용
+        self._hash_format = f'<{bands * rows}H'
+        self._digest_size = bands * rows * 2
+        self._shingle_hashes = {}
+        self.buckets = {}
+        self.shingles = []
+        self.numbers = []
+        self.canonical_ids = []
+
+    def _hashes(self, shingle):
+        hashes = self._shingle_hashes.get(shingle)
+        if hashes is None:
+            digest = hashlib.blake2b(shingle.encode('utf-8'), digest_size=self._digest_size).digest()
+            hashes = self._shingle_hashes[shingle] = struct.unpack(self._hash_format, digest)
+        return hashes
+
+    # MinHash 서명: 해시 함수마다 조각들의 최솟값
+    def signature(self, shingles):
+        return list(map(min, zip(*[self._hashes(shingle) for shingle in shingles])))
+
+    def _band_keys(self, signature):
+        rows = self.rows
+        return [(band, tuple(signature[band * rows:(band + 1) * rows])) for band in range(self.bands)]
+
+    # 자료를 색인에 넣고, 먼저 들어간 자료와 근접 중복이면 그 묶음의 대표 id를 돌려줌
+    def add(self, material_id, title):
+        shingles = title_shingles(title)
+        numbers = title_numbers(title)
+        position = len(self.shingles)
+        self.shingles.append(shingles)
+        self.numbers.append(numbers)
+        if not shingles:
+            self.canonical_ids.append(material_id)
+            return None
+
+        keys = self._band_keys(self.signature(shingles))
+        shared_bands = Counter()
+        for key in keys:
+            shared_bands.update(self.buckets.get(key, ()))
+
+        canonical = None
+        size = len(shingles)
+        for candidate, _ in shared_bands.most_common(self.max_candidates):
+            other = self.shingles[candidate]
+            # 조각 수 차이가 크면 유사도가 기준에 못 미치므로 집합 연산 없이 건너뜀
+            if min(size, len(other)) < self.threshold * max(size, len(other)):
+                continue
+            # 연도나 권·호만 다른 제목은 글자 조각이 몇 개만 달라 유사도가 기준을 넘으므로 숫자가 같아야 함
+            if numbers != self.numbers[candidate]:
+                continue
+            if jaccard(shingles, other) >= self.threshold:
+                canonical = self.canonical_ids[candidate]
+                break
+
+        self.canonical_ids.append(canonical or material_id)
+        # 묶음의 대표만 버킷에 넣어 비슷한 제목이 많아도 버킷이 커지지 않게 함
+        if canonical is None:
+            for key in keys:
+                bucket = self.buckets.setdefault(key, [])
+                if len(bucket) < self.max_bucket_size:
+                    bucket.append(position)
+        return canonical
+
+# 자료 목록 순서대로 색인에 넣으면서 근접 중복 자료에 대표 id(duplicate_of) 기록
+# 같은 목록에 다시 실행해도 결과가 같고, 바뀐 자료 수를 돌려줌
+def mark_near_duplicates(materials, index=None):
+    index = index or NearDuplicateIndex()
+    changed = 0
+    for material in materials:
+        canonical = index.add(material.get('id'), material.get('title'))
+        if canonical and canonical != material.get('id'):
+            if material.get('duplicate_of') != canonical:
+                material['duplicate_of'] = canonical
+                changed += 1
+        elif 'duplicate_of' in material:
+            del material['duplicate_of']
+            changed += 1
+    return changed
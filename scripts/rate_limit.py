@@ -0,0 +1,201 @@
+import math
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+
+# 호스트별 최대 요청 속도(초당 요청 수)와 한 번에 몰아서 보낼 수 있는 요청 수
+# 응답이 좋으면 이 속도까지 올라가고, 429/5xx/시간 초과가 나면 절반씩 줄어듦
+HOST_RATE = 0.5
+HOST_BURST = 1
+HOST_MIN_RATE = 1 / 30
+# 성공할 때마다 최대 속도의 이만큼씩 다시 올림
+HOST_RATE_STEP = 0.1
+
+# 재시도할 응답 코드와 재시도 횟수, 대기 시간(초)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 3
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+# 서버가 Retry-After로 이보다 오래 기다리라고 하면 이번 실행에서는 포기
+MAX_RETRY_AFTER = 120.0
+
+# 실행 시간 예산을 넘겨 더 이상 요청하지 않을 때
+class TimeBudgetExceeded(Exception):
+    pass
+
+# 한 번의 실행에 쓸 수 있는 시간 (seconds가 None이면 제한 없음)
+class RunBudget:
+    def __init__(self, seconds=None):
+        self.deadline = time.monotonic() + seconds if seconds else None
+
+    def remaining(self):
+        if self.deadline is None:
+            return math.inf
+        return max(0.0, self.deadline - time.monotonic())
+
+    def check(self, needed=0.0):
+        if self.remaining() <= needed:
+            raise TimeBudgetExceeded("실행 시간 예산을 모두 사용했습니다.")
+
+# 호스트 하나의 토큰 버킷
+# 토큰이 모자라면 음수로 빌려 두고 그만큼 기다리므로, 동시에 요청해도 순서대로 간격이 벌어짐
+class TokenBucket:
+    def __init__(self, rate=HOST_RATE, capacity=HOST_BURST, min_rate=HOST_MIN_RATE):
+        self.max_rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    # 토큰 하나를 가져가고 기다려야 할 시간(초)을 돌려줌
+    def reserve(self):
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.paused_until - now)
+
+    # 예약했지만 요청하지 않은 토큰 돌려주기
+    def cancel(self):
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + 1)
+
+    def slow_down(self):
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = max(self.min_rate, self.rate / 2)
+
+    def speed_up(self):
+        with self._lock:
+            if self.rate < self.max_rate:
+                self._refill(time.monotonic())
+                self.rate = min(self.max_rate, self.rate + self.max_rate * HOST_RATE_STEP)
+
+    # Retry-After 등으로 서버가 요청한 시간 동안 이 호스트로는 요청하지 않음
+    def pause(self, seconds):
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+# 호스트별 토큰 버킷 모음 (다른 호스트 요청은 서로 기다리지 않음)
+class HostRateLimiter:
+    def __init__(self, rate=HOST_RATE, burst=HOST_BURST, min_rate=HOST_MIN_RATE):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def bucket(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.rate, self.burst, self.min_rate)
+            return bucket
+
+    # 요청 차례가 될 때까지 대기 (예산 안에 차례가 오지 않으면 기다리지 않고 중단)
+    def wait(self, url, budget=None):
+        bucket = self.bucket(url)
+        delay = bucket.reserve()
+        if budget is not None and delay >= budget.remaining():
+            bucket.cancel()
+            raise TimeBudgetExceeded(f"{urlsplit(url).netloc} 요청 차례가 실행 시간 예산 안에 오지 않습니다.")
+        if delay > 0:
+            time.sleep(delay)
+
+    def record_success(self, url):
+        self.bucket(url).speed_up()
+
+    def record_failure(self, url, retry_after=None):
+        bucket = self.bucket(url)
+        bucket.slow_down()
+        if retry_after:
+            bucket.pause(retry_after)
+
+# Retry-After 헤더(초 또는 HTTP 날짜)를 기다릴 시간(초)으로 변환
+def retry_after_seconds(value):
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+# 재시도 횟수와 지수 백오프(full jitter) 대기 시간
+class RetryPolicy:
+    def __init__(self, max_retries=MAX_RETRIES, base=BACKOFF_BASE, cap=BACKOFF_MAX,
+                 max_retry_after=MAX_RETRY_AFTER, statuses=RETRY_STATUSES):
+        self.max_retries = max_retries
+        self.base = base
+        self.cap = cap
+        self.max_retry_after = max_retry_after
+        self.statuses = set(statuses)
+
+    # attempt번째 재시도 전 대기 시간 (Retry-After가 있으면 그보다 짧게 기다리지 않음)
+    def delay(self, attempt, retry_after=None):
+        backoff = random.uniform(0, min(self.cap, self.base * 2 ** attempt))
+        return max(backoff, retry_after or 0.0)
+
+# 요청 하나를 재시도하며 보냄
+# send(timeout)는 실제 요청 함수. 재시도할 수 없으면 마지막 응답을 돌려주거나 마지막 예외를 올림
+# on_timing(wait_seconds, send_seconds)에는 속도 제한·재시도 대기 시간과 실제 요청 시간을 나눠 알려 줌
+def request_with_retry(url, send, limiter, policy, budget, timeout=10, on_retry=None, on_timing=None):
+    attempt = 0
+    waited = sent = 0.0
+    try:
+        while True:
+            start = time.perf_counter()
+            limiter.wait(url, budget)
+            budget.check()
+            waited += time.perf_counter() - start
+            response = None
+            start = time.perf_counter()
+            try:
+                response = send(min(timeout, budget.remaining()))
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                error, retry_after = e, None
+            else:
+                if response.status_code not in policy.statuses:
+                    limiter.record_success(url)
+                    return response
+                error = f"HTTP {response.status_code}"
+                retry_after = retry_after_seconds(response.headers.get('Retry-After'))
+            finally:
+                sent += time.perf_counter() - start
+
+            limiter.record_failure(url, retry_after)
+            delay = policy.delay(attempt, retry_after)
+            give_up = (attempt >= policy.max_retries
+                       or (retry_after or 0) > policy.max_retry_after
+                       or delay >= budget.remaining())
+            if give_up:
+                if response is not None:
+                    return response
+                raise error
+            if on_retry:
+                on_retry(error, delay)
+            time.sleep(delay)
+            waited += delay
+            attempt += 1
+    finally:
+        if on_timing:
+            on_timing(waited, sent)
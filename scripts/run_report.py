@@ -0,0 +1,175 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from storage import write_json_atomic
+
+# 실행 보고서 파일과 보관할 지난 실행 수 (매주 실행 기준 약 1년)
+RUN_REPORT_FILE = 'data/run_report.json'
+RUN_HISTORY_LIMIT = 52
+# 연구원마다 보고서에 남길 오류 메시지 수
+MAX_ERRORS_PER_INSTITUTE = 20
+
+def _new_institute_record():
+    return {
+        "status": "pending",
+        "pages": 0,
+        "requests": 0,
+        "retries": 0,
+        "bytes": 0,
+        "http_status": {},
+        "fetch_seconds": 0.0,
+        "wait_seconds": 0.0,
+        "parse_seconds": 0.0,
+        "extract_seconds": 0.0,
+        "rows_matched": 0,
+        "new_items": 0,
+        "empty_pages": 0,
+        "errors": [],
+    }
+
+# 한 번의 실행 동안 연구원별 요청·파싱·추출 결과와 저장 시간을 모음
+class RunMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = datetime.now()
+        self._start_clock = time.perf_counter()
+        self.institutes = {}
+        self.stages = {}
+        self.totals = {}
+
+    def _record(self, institute_id):
+        return self.institutes.setdefault(institute_id, _new_institute_record())
+
+    # 단계 시간 측정 (institute_id가 없으면 실행 전체 단계로 기록)
+    @contextmanager
+    def timer(self, stage, institute_id=None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                if institute_id is None:
+                    self.stages[stage] = self.stages.get(stage, 0.0) + elapsed
+                else:
+                    record = self._record(institute_id)
+                    record[f"{stage}_seconds"] += elapsed
+
+    # 보고서의 연구원 순서를 institutes.json 순서로 맞추기 위해 미리 등록
+    def register(self, institute_id):
+        with self._lock:
+            self._record(institute_id)
+
+    def record_fetch(self, institute_id, status, size):
+        with self._lock:
+            record = self._record(institute_id)
+            record["requests"] += 1
+            record["bytes"] += size
+            key = str(status)
+            record["http_status"][key] = record["http_status"].get(key, 0) + 1
+
+    # 요청 하나에 걸린 시간: 속도 제한·재시도 대기(wait)와 실제 요청(fetch)을 나눠 기록
+    def record_timing(self, institute_id, wait_seconds, fetch_seconds):
+        with self._lock:
+            record = self._record(institute_id)
+            record["wait_seconds"] += wait_seconds
+            record["fetch_seconds"] += fetch_seconds
+
+    # 시간 초과나 429/5xx 응답으로 같은 요청을 다시 보냄
+    def record_retry(self, institute_id):
+        with self._lock:
+            self._record(institute_id)["retries"] += 1
+
+    # 게시판 한 페이지에서 선택자가 찾은 행 수 (0이면 선택자가 깨졌을 가능성)
+    def record_rows(self, institute_id, count):
+        with self._lock:
+            record = self._record(institute_id)
+            record["pages"] += 1
+            record["rows_matched"] += count
+            if count == 0:
+                record["empty_pages"] += 1
+
+    def record_new_item(self, institute_id, count=1):
+        with self._lock:
+            self._record(institute_id)["new_items"] += count
+
+    def record_error(self, institute_id, stage, error):
+        with self._lock:
+            errors = self._record(institute_id)["errors"]
+            if len(errors) < MAX_ERRORS_PER_INSTITUTE:
+                errors.append({"stage": stage, "type": type(error).__name__, "message": str(error)})
+
+    def set_status(self, institute_id, status):
+        with self._lock:
+            self._record(institute_id)["status"] = status
+
+    def set_total(self, name, value):
+        with self._lock:
+            self.totals[name] = value
+
+    # 연구원 상태 정리: 오류 / 선택자가 행을 하나도 못 찾음 / 변경 없음 / 정상
+    def _final_status(self, record):
+        if record["status"] != "pending":
+            return record["status"]
+        if record["errors"]:
+            return "error"
+        if record["pages"] and record["rows_matched"] == 0:
+            return "no_rows"
+        if record["pages"] == 0:
+            return "unchanged"
+        return "ok"
+
+    def report(self):
+        with self._lock:
+            institutes = {}
+            for institute_id, record in self.institutes.items():
+                record = dict(record, status=self._final_status(record))
+                for key in ("fetch_seconds", "wait_seconds", "parse_seconds", "extract_seconds"):
+                    record[key] = round(record[key], 3)
+                institutes[institute_id] = record
+            return {
+                "started": self.started.strftime('%Y-%m-%d %H:%M:%S'),
+                "duration_seconds": round(time.perf_counter() - self._start_clock, 3),
+                "totals": dict(self.totals),
+                "stages": {stage: round(seconds, 3) for stage, seconds in self.stages.items()},
+                "institutes": institutes,
+            }
+
+# 지난 실행 기록에는 연구원별 요약만 남김
+def summarize_run(run):
+    return {
+        "started": run["started"],
+        "duration_seconds": run["duration_seconds"],
+        "totals": run["totals"],
+        "institutes": {
+            institute_id: {
+                "status": record["status"],
+                "new_items": record["new_items"],
+                "rows_matched": record["rows_matched"],
+                "fetch_seconds": record["fetch_seconds"],
+                "wait_seconds": record.get("wait_seconds", 0.0),
+                "retries": record.get("retries", 0),
+                "errors": len(record["errors"]),
+            }
+            for institute_id, record in run["institutes"].items()
+        },
+    }
+
+def load_run_report(path=RUN_REPORT_FILE):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+# 실행 보고서 저장: 이번 실행 상세 + 최근 실행 요약 기록
+def save_run_report(metrics, path=RUN_REPORT_FILE, history_limit=RUN_HISTORY_LIMIT):
+    run = metrics.report()
+    history = list(load_run_report(path).get("history", []))
+    history.append(summarize_run(run))
+    report = {"latest": run, "history": history[-history_limit:]}
+    write_json_atomic(path, report)
+    return report
@@ -0,0 +1,54 @@
+import unicodedata
+
+from storage import write_json_atomic
+
+# 검색 색인 파일 (all_materials.json과 같은 순서의 자료 번호를 문서 ID로 사용)
+SEARCH_INDEX_FILE = 'data/search_index.json'
+SEARCH_INDEX_VERSION = 1
+
+# 검색 대상 문자열 정규화 (search.js의 normalizeText와 같은 규칙)
+def normalize_text(text):
+    return unicodedata.normalize('NFC', str(text or '')).lower()
+
+# 문자 n-gram 추출 (공백이 들어간 조각은 제외)
+# 한글은 띄어쓰기 없이 붙여 쓰는 경우가 많아 형태소 대신 글자 단위 조각을 사용
+def text_grams(text):
+    text = normalize_text(text)
+    grams = {ch for ch in text if not ch.isspace()}
+    grams.update(text[i:i + 2] for i in range(len(text) - 1) if not any(ch.isspace() for ch in text[i:i + 2]))
+    return grams
+
+# 자료 하나의 검색 대상(제목, 연구원, 태그)에서 나오는 모든 조각
+def material_grams(material):
+    grams = set()
+    for field in [material.get('title'), material.get('institute')] + list(material.get('tags') or []):
+        grams.update(text_grams(field))
+    return grams
+
+# 역색인 생성: 조각마다 그 조각을 가진 문서 ID 목록(오름차순, 앞 값과의 차이로 저장)
+def build_search_index(materials):
+    postings = {}
+    for doc_id, material in enumerate(materials):
+        for gram in material_grams(material):
+            postings.setdefault(gram, []).append(doc_id)
+
+    encoded = {}
+    for gram in sorted(postings):
+        previous = 0
+        gaps = []
+        for doc_id in postings[gram]:
+            gaps.append(doc_id - previous)
+            previous = doc_id
+        encoded[gram] = gaps
+
+    return {
+        "version": SEARCH_INDEX_VERSION,
+        "count": len(materials),
+        "postings": encoded,
+    }
+
+# 검색 색인 저장 (용량을 줄이기 위해 공백 없이 기록)
+def save_search_index(materials, path=SEARCH_INDEX_FILE):
+    index = build_search_index(materials)
+    write_json_atomic(path, index, compact=True)
+    return index
@@ -0,0 +1,61 @@
+import hashlib
+import json
+import os
+import re
+
+from storage import write_atomic, write_json_atomic
+
+# 페이지가 필요한 부분만 받아 갈 수 있도록 나눠 저장하는 폴더와 목록 파일
+SHARD_DIR = 'data/shards'
+SHARD_MANIFEST_FILE = 'data/shards/manifest.json'
+SHARD_MANIFEST_VERSION = 1
+
+# 공백 없는 JSON 문자열 (같은 자료면 항상 같은 내용이 나오도록 순서 유지)
+def dump_compact(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:16]
+
+# 파일 이름에 쓸 수 없는 문자 정리
+def shard_slug(text):
+    slug = re.sub(r'[^0-9A-Za-z가-힣_-]+', '-', str(text)).strip('-')
+    return slug or 'unknown'
+
+# 연구원별, 유형·연도별로 자료 나누기 (자료 순서는 원래 순서 그대로)
+def partition_materials(materials, institutes):
+    institute_ids = {institute['name']: institute['id'] for institute in institutes}
+    partitions = {'institute': {}, 'type_year': {}}
+    for material in materials:
+        institute_key = institute_ids.get(material.get('institute')) or shard_slug(material.get('institute'))
+        type_year_key = f"{shard_slug(material.get('type') or 'unknown')}-{shard_slug(material.get('year') or 'unknown')}"
+        partitions['institute'].setdefault(institute_key, []).append(material)
+        partitions['type_year'].setdefault(type_year_key, []).append(material)
+    return partitions
+
+# 조각 파일들과 목록 파일(manifest) 저장
+def save_shards(materials, institutes, shard_dir=SHARD_DIR, manifest_path=SHARD_MANIFEST_FILE):
+    manifest = {"version": SHARD_MANIFEST_VERSION, "total": len(materials), "shards": {}}
+    written = set()
+
+    for kind, groups in partition_materials(materials, institutes).items():
+        os.makedirs(os.path.join(shard_dir, kind), exist_ok=True)
+        entries = {}
+        for key in sorted(groups):
+            data = dump_compact(groups[key])
+            relative_path = f"{kind}/{key}.json"
+            write_atomic(os.path.join(shard_dir, relative_path), data)
+            written.add(os.path.normpath(os.path.join(shard_dir, relative_path)))
+            entries[key] = {"file": relative_path, "count": len(groups[key]), "hash": content_hash(data)}
+        manifest["shards"][kind] = entries
+
+    # 더 이상 해당 자료가 없는 예전 조각 파일 삭제
+    for kind in manifest["shards"]:
+        directory = os.path.join(shard_dir, kind)
+        for name in os.listdir(directory):
+            path = os.path.normpath(os.path.join(directory, name))
+            if name.endswith('.json') and path not in written:
+                os.remove(path)
+
+    write_json_atomic(manifest_path, manifest)
+    return manifest
@@ -0,0 +1,71 @@
+import json
+import os
+import tempfile
+
+# 같은 폴더의 임시 파일에 다 쓴 뒤 os.replace로 바꿔치기
+# 쓰는 도중 중단되어도 기존 파일은 그대로 남음
+def write_atomic(path, data):
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+# JSON 파일을 원자적으로 저장 (compact=True면 공백 없이)
+def write_json_atomic(path, data, compact=False):
+    if compact:
+        text = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    else:
+        text = json.dumps(data, ensure_ascii=False, indent=2)
+    write_atomic(path, text.encode('utf-8'))
+
+# 저널(JSON Lines)에 기록 추가 (기존 내용은 건드리지 않음)
+def append_journal(path, records):
+    records = list(records)
+    if not records:
+        return
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    # 이전 기록이 줄 중간에서 끊겼으면 새 기록이 그 줄에 붙지 않도록 줄을 바꿈
+    needs_newline = False
+    if os.path.exists(path) and os.path.getsize(path) > 0:
+        with open(path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b'\n'
+    with open(path, 'a', encoding='utf-8') as f:
+        if needs_newline:
+            f.write('\n')
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+
+# 저널을 한 줄씩 읽기 (중간에 끊긴 마지막 줄 등 읽을 수 없는 줄은 건너뜀)
+def read_journal(path):
+    try:
+        f = open(path, 'r', encoding='utf-8')
+    except FileNotFoundError:
+        return
+    with f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                print(f"  > 저널 {path} {line_number}번째 줄을 읽을 수 없어 건너뜁니다.")
+
+# 저널 내용이 스냅샷에 반영된 뒤 저널 비우기
+def clear_journal(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
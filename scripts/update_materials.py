@@ -1,25 +1,154 @@
+import argparse
 import json
 import os
 import requests
-from bs4 import BeautifulSoup
-import time
-import random
+from bs4 import BeautifulSoup, SoupStrainer
+import threading
+import re
+import soupsieve
+import unicodedata
+from artifacts import publish_artifacts
+from classifier import build_classifier, load_taxonomy
+from concurrent.futures import ThreadPoolExecutor
+from enrich import DEFAULT_ENRICH_WORKERS, ENRICH_RESERVE, DetailCache, DetailParser, enrich_materials, needs_details
+from feed import save_feeds
+from link_check import DEFAULT_LINK_MAX_AGE_DAYS, DEFAULT_LINK_WORKERS, check_links, is_broken, links_due
 from datetime import datetime
-
-# 기존 자료 데이터 불러오기
+from requests.adapters import HTTPAdapter
+from near_duplicates import NearDuplicateIndex, mark_near_duplicates
+from rate_limit import HostRateLimiter, RetryPolicy, RunBudget, TimeBudgetExceeded, request_with_retry
+from run_report import RunMetrics, save_run_report
+from search_index import save_search_index
+from shards import save_shards
+from storage import append_journal, clear_journal, read_journal, write_json_atomic
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+# 전체 자료 스냅샷과, 스냅샷에 아직 반영되지 않은 새 자료 저널
+MATERIALS_FILE = 'data/all_materials.json'
+MATERIALS_JOURNAL_FILE = 'data/materials_journal.jsonl'
+# 저널이 이 크기(바이트)를 넘으면 스냅샷에 반영하고 저널을 비움 (그 전에는 저널에만 덧붙임)
+JOURNAL_COMPACT_BYTES = 2 * 1024 * 1024
+# 기존 자료에서 실행마다 바뀔 수 있는 항목 (근접 중복 표시, 링크 확인 결과, 뒤늦게 받은 상세 정보). 바뀐 값만 저널에 기록
+JOURNALED_FIELDS = ('duplicate_of', 'status', 'last_checked', 'subject', 'grade', 'date', 'attachments')
+# 한 번의 실행에 쓸 최대 시간(분). 넘으면 남은 요청은 보내지 않고 다음 실행으로 미룸
+DEFAULT_TIME_BUDGET_MINUTES = 40
+# 동시에 크롤링할 연구원 수 기본값
+DEFAULT_WORKERS = 4
+# 조건부 요청(ETag/Last-Modified) 정보를 보관하는 파일
+HTTP_CACHE_FILE = '.cache/http_cache.json'
+# 연구원별 마지막으로 본 게시글(워터마크)을 기록하는 파일
+CRAWL_STATE_FILE = 'data/crawl_state.json'
+# 평소 실행에서 게시판당 최대로 넘겨볼 페이지 수
+MAX_PAGES = 10
+# 전체 수집(backfill) 모드에서 게시판당 최대 페이지 수와 미리 받아 둘 페이지 수
+BACKFILL_MAX_PAGES = 1000
+DEFAULT_BACKFILL_WORKERS = 3
+backfill_workers = DEFAULT_BACKFILL_WORKERS
+
+# 중복 비교용 문자열 정규화 (유니코드 정규화, 공백 정리, 대소문자 무시)
+def normalize_key(text):
+    text = unicodedata.normalize('NFC', str(text or ''))
+    return ' '.join(text.split()).casefold()
+
+# 자료의 중복 확인 키 (제목+연구원, URL)
+def material_keys(title, institute, url=None):
+    keys = [('title', normalize_key(title), normalize_key(institute))]
+    if url:
+        keys.append(('url', url.strip()))
+    return keys
+
+# 중복 확인 색인을 함께 들고 다니는 자료 목록
+class MaterialList(list):
+    def __init__(self, materials=(), keys=None):
+        super().__init__(materials)
+        if keys is None:
+            keys = set()
+            for material in self:
+                keys.update(material_keys(material.get('title'), material.get('institute'), material.get('url')))
+        self.keys = keys
+
+    def append(self, material):
+        super().append(material)
+        self.keys.update(material_keys(material.get('title'), material.get('institute'), material.get('url')))
+
+    def extend(self, materials):
+        for material in materials:
+            self.append(material)
+
+    def copy(self):
+        return MaterialList(self, keys=set(self.keys))
+
+    # 앞의 length개만 남기고 색인도 다시 만듦
+    def truncate(self, length):
+        del self[length:]
+        self.keys = MaterialList(self).keys
+
+    def contains(self, title, institute, url=None):
+        return any(key in self.keys for key in material_keys(title, institute, url))
+
+# 기존 자료 데이터 불러오기 (스냅샷 + 지난 실행에서 저널에만 남은 자료)
+# 스냅샷이 깨져 있으면 빈 목록으로 덮어쓰지 않도록 오류를 그대로 올림
 def load_existing_materials():
     try:
-        with open('data/all_materials.json', 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
+        with open(MATERIALS_FILE, 'r', encoding='utf-8') as f:
+            materials = MaterialList(json.load(f))
+    except FileNotFoundError:
+        materials = MaterialList()
+    except json.JSONDecodeError as e:
+        print(f"{MATERIALS_FILE} 파일을 읽을 수 없습니다: {e}")
+        raise
+
+    updates = []
+    for record in read_journal(MATERIALS_JOURNAL_FILE):
+        if record.get('op') == 'update':
+            updates.append(record)
+        elif is_new_material(materials, record.get('title'), record.get('institute'), record.get('url')):
+            materials.append(record)
+    apply_updates(materials, updates)
+    return materials
 
-# 새 자료인지 확인
-def is_new_material(materials, title, institute):
+# 저널의 항목 변경 기록을 (id, url)이 같은 자료에 차례로 적용
+def apply_updates(materials, updates):
+    if not updates:
+        return
+    by_key = {}
     for material in materials:
-        if material['title'] == title and material['institute'] == institute:
-            return False
-    return True
+        by_key.setdefault((material.get('id'), material.get('url')), []).append(material)
+    for update in updates:
+        for material in by_key.get((update.get('id'), update.get('url')), []):
+            material.update(update.get('set', {}))
+            for field in update.get('unset', []):
+                material.pop(field, None)
+
+_MISSING = object()
+
+# 기존 자료의 변경 가능 항목 값을 기억해 둠 (나중에 field_updates()로 바뀐 것만 골라냄)
+def tracked_fields(materials):
+    return [tuple(material.get(field, _MISSING) for field in JOURNALED_FIELDS) for material in materials]
+
+# 기억해 둔 값과 비교해 바뀐 자료마다 저널용 변경 기록을 만듦
+def field_updates(materials, before):
+    updates = []
+    for material, old_values in zip(materials, before):
+        changed = {}
+        removed = []
+        for field, old_value in zip(JOURNALED_FIELDS, old_values):
+            value = material.get(field, _MISSING)
+            if value is _MISSING:
+                if old_value is not _MISSING:
+                    removed.append(field)
+            elif value != old_value:
+                changed[field] = value
+        if changed or removed:
+            updates.append({"op": "update", "id": material.get('id'), "url": material.get('url'),
+                            "set": changed, "unset": removed})
+    return updates
+
+# 새 자료인지 확인 (MaterialList면 색인으로 바로 확인)
+def is_new_material(materials, title, institute, url=None):
+    if not isinstance(materials, MaterialList):
+        materials = MaterialList(materials)
+    return not materials.contains(title, institute, url)
 
 # 연구원 정보 불러오기
 def load_institutes():
@@ -29,401 +158,690 @@ def load_institutes():
     except (FileNotFoundError, json.JSONDecodeError):
         return []
 
-# 자료 저장하기
-def save_materials(materials):
-    os.makedirs('data', exist_ok=True) # data 폴더가 없으면 생성
-    with open('data/all_materials.json', 'w', encoding='utf-8') as f:
-        json.dump(materials, f, ensure_ascii=False, indent=2)
-
-# 서울교육연구정보원 크롤링 함수
-def crawl_seoul_institute(materials, institute_info):
-    base_url = "https://www.serii.re.kr"
-    print(f"  > {institute_info['name']} 크롤링 시작...")
-    
-    try:
-        # 서울교육연구정보원 자체연구 페이지
-        research_url = f"{base_url}/fus/MI000000000000000493/board/BO00000341/ctgynone/list0010v.do"
-        response = requests.get(research_url, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'lxml')
-        
-        # 디버깅: HTML 구조 확인
-        print(f"  > HTML 구조 확인: {len(soup.select('table.board-list'))} 테이블 발견")
-        
-        # 게시글 목록 찾기 - 여러 선택자 시도
-        items = soup.select('.board_list tbody tr') or soup.select('table.board-list tbody tr') or soup.select('.board_wrap table tbody tr')
-        print(f"  > 발견된 게시글 수: {len(items)}")
-        
-        for item in items:
-            try:
-                # 제목과 링크 추출 - 여러 선택자 시도
-                title_elem = item.select_one('td.subject a') or item.select_one('td.title a') or item.select_one('td a')
-                date_elem = item.select_one('td.date') or item.select_one('td:nth-child(4)')
-                
-                if not title_elem:
-                    continue
-                    
-                title = title_elem.get_text(strip=True)
-                link = title_elem.get('href')
-                print(f"  > 발견된 제목: {title}, 링크: {link}")
-                
-                if link and not link.startswith('http'):
-                    if link.startswith('/'):
-                        link = base_url + link
-                    else:
-                        link = base_url + '/' + link
-                
-                if title and link and is_new_material(materials, title, institute_info['name']):
-                    material_id = f"seoul_{len(materials) + 1:03d}"
-                    
-                    # 자료 유형 판단
-                    detected_type = "report"
-                    if "지도안" in title or "교수학습자료" in title or "수업자료" in title:
-                        detected_type = "guide"
-                    
-                    # 연도 추출
-                    detected_year = datetime.now().year
-                    if date_elem:
-                        date_text = date_elem.get_text(strip=True)
-                        try:
-                            if '-' in date_text:
-                                detected_year = int(date_text.split('-')[0])
-                            elif '.' in date_text:
-                                detected_year = int(date_text.split('.')[0])
-                        except:
-                            pass
-                    
-                    # 태그 추출
-                    detected_tags = ["서울", "교육연구", "자체연구"]
-                    keywords = ["교육과정", "교육정책", "미래교육", "AI", "과학", "수학", "진로", "교원"]
-                    for keyword in keywords:
-                        if keyword in title:
-                            detected_tags.append(keyword)
-                    
-                    new_material = {
-                        "id": material_id,
-                        "title": title,
-                        "institute": institute_info['name'],
-                        "type": detected_type,
-                        "year": str(detected_year),
-                        "tags": detected_tags,
-                        "url": link
-                    }
-                    
-                    materials.append(new_material)
-                    print(f"    - 새 자료 추가: {title} (유형: {detected_type}, 연도: {detected_year})")
-            except Exception as e:
-                print(f"    - 자료 추출 중 오류 발생: {e}")
-                
-    except requests.exceptions.RequestException as e:
-        print(f"  > 요청 오류: {institute_info['name']} - {e}")
-    except Exception as e:
-        print(f"  > 서울교육연구정보원 크롤링 중 알 수 없는 오류: {e}")
-    
-    return materials
-    
-# 부산교육연구소 크롤링 함수
-def crawl_busan_institute(materials, institute_info):
-    base_url = "https://www.beri.pe.kr"
-    print(f"  > {institute_info['name']} 크롤링 시작...")
+# 이번 실행의 연구원별 지표 (main()에서 새로 만듦)
+metrics = RunMetrics()
+
+# 호스트별 요청 속도 조절 (서버 부하 방지 및 차단 방지)과 재시도 규칙
+limiter = HostRateLimiter()
+retry_policy = RetryPolicy()
+# 이번 실행의 시간 예산 (main()에서 새로 만듦)
+budget = RunBudget()
+# 링크 확인은 가벼운 요청이라 같은 호스트에 조금 더 자주 보내고, 재시도는 한 번만 함
+LINK_CHECK_RATE = 2.0
+link_limiter = HostRateLimiter(rate=LINK_CHECK_RATE, burst=2)
+link_retry_policy = RetryPolicy(max_retries=1)
+
+# 호스트별로 연결을 재사용하는 세션 모음
+class SessionPool:
+    def __init__(self, pool_size=4):
+        self.pool_size = pool_size
+        self._lock = threading.Lock()
+        self._sessions = {}
+
+    def get(self, url):
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._sessions[host] = session
+            return session
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+sessions = SessionPool()
+
+# URL별 ETag/Last-Modified를 기억해 두었다가 조건부 요청에 사용
+class HttpCache:
+    def __init__(self, path=HTTP_CACHE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self.entries = {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+    def headers_for(self, url):
+        with self._lock:
+            entry = self.entries.get(url, {})
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def remember(self, url, response):
+        entry = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        }
+        with self._lock:
+            if entry['etag'] or entry['last_modified']:
+                self.entries[url] = entry
+            else:
+                self.entries.pop(url, None)
+
+    # 자료 저장이 끝난 뒤에 기록해야 중간에 실패해도 다음 실행에서 다시 받아옴
+    def save(self):
+        with self._lock:
+            entries = dict(self.entries)
+        write_json_atomic(self.path, entries)
+
+http_cache = None
+
+# 조건부 요청 캐시 (처음 쓸 때 파일에서 불러옴)
+def get_http_cache():
+    global http_cache
+    if http_cache is None:
+        http_cache = HttpCache()
+    return http_cache
+
+# 호스트별 속도 제한을 지키며 페이지 요청 (시간 초과, 429, 5xx는 간격을 늘려 가며 재시도)
+# 지난번과 내용이 같으면(304) None을 돌려주므로 호출한 쪽은 파싱을 건너뜀
+# remember=False면 ETag/Last-Modified를 바로 기록하지 않음 (호출한 쪽이 일을 다 마친 뒤 기록)
+def fetch(url, timeout=10, conditional=True, on_retry=None, remember=True, on_timing=None):
+    cache = get_http_cache() if conditional else None
+    headers = cache.headers_for(url) if cache else {}
+    session = sessions.get(url)
+    response = request_with_retry(
+        url,
+        lambda request_timeout: session.get(url, headers=headers, timeout=request_timeout),
+        limiter, retry_policy, budget, timeout=timeout, on_retry=on_retry, on_timing=on_timing,
+    )
+    if response.status_code == 304:
+        return None
+    if cache and response.ok and remember:
+        cache.remember(url, response)
+    return response
+
+# 링크가 살아 있는지 확인하는 요청 (리디렉션을 따라가고, GET이어도 본문은 받지 않음)
+def check_request(url, method, timeout=10):
+    session = sessions.get(url)
+
+    def send(request_timeout):
+        response = session.request(method, url, timeout=request_timeout, allow_redirects=True, stream=True)
+        response.close()
+        return response
+
+    return request_with_retry(url, send, link_limiter, link_retry_policy, budget, timeout=timeout)
+
+# 연구원별 워터마크(가장 최근에 본 게시글 URL) 보관
+class CrawlState:
+    def __init__(self, path=CRAWL_STATE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self.entries = {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+    def last_seen_url(self, institute_id):
+        with self._lock:
+            return self.entries.get(institute_id, {}).get('last_seen_url')
+
+    def update(self, institute_id, url):
+        with self._lock:
+            self.entries[institute_id] = {
+                'last_seen_url': url,
+                'updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            }
+
+    # HTTP 캐시와 마찬가지로 자료 저장이 끝난 뒤에 기록
+    def save(self):
+        with self._lock:
+            entries = dict(self.entries)
+        write_json_atomic(self.path, entries)
+
+crawl_state = None
+
+def get_crawl_state():
+    global crawl_state
+    if crawl_state is None:
+        crawl_state = CrawlState()
+    return crawl_state
+
+# 페이지 전체를 파싱
+def parse_full_page(html):
+    return BeautifulSoup(html, 'lxml')
+
+# lxml은 표의 하위 태그를 항상 <table> 안에 두므로, table만 남겨도 이 태그들은 그대로 남음
+TABLE_PART_TAGS = {'thead', 'tbody', 'tfoot', 'tr', 'td', 'th'}
+
+# 일부 태그만 남긴 트리(parse_only)에서도 전체 트리와 같은 행을 찾는 선택자인지 확인
+# 맨 앞 단계가 남기는 태그여야 하고(조상으로 div 등을 요구하면 안 됨), 형제 결합자(+, ~)와
+# 맨 앞 단계의 가상 클래스(:first-of-type 등)는 빠진 형제 때문에 결과가 달라질 수 있어 허용하지 않음
+def strain_safe(selector, kept_tags):
+    kept_tags = {tag.lower() for tag in kept_tags}
+    if 'table' in kept_tags:
+        kept_tags |= TABLE_PART_TAGS
+    # 속성 값과 괄호 안의 글자는 결합자로 보지 않도록 먼저 지움
+    stripped = selector
+    while True:
+        reduced = re.sub(r'\[[^\[\]]*\]|\([^()]*\)', '', stripped)
+        if reduced == stripped:
+            break
+        stripped = reduced
+    for part in stripped.split(','):
+        part = part.strip()
+        if not part or '+' in part or '~' in part:
+            return False
+        first = re.split(r'\s*>\s*|\s+', part, maxsplit=1)[0]
+        if ':' in first:
+            return False
+        tag = re.match(r'[A-Za-z][\w-]*', first)
+        if tag is None or tag.group(0).lower() not in kept_tags:
+            return False
+    return True
 
-    try:
-        # 부산교육연구소 자료실 URL (예시)
-        response = requests.get(f"{base_url}/bbs/board.php?bo_table=data", timeout=10)
+# 목록 URL에 페이지 번호 파라미터 붙이기
+def with_page(url, page_param, page):
+    parts = urlsplit(url)
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if key != page_param]
+    query.append((page_param, str(page)))
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), parts.fragment))
+
+# 게시판 목록을 페이지 단위로 넘겨주는 도우미
+# 평소에는 이미 알고 있는 게시글(기존 자료 또는 워터마크)이 나온 페이지에서 멈추고,
+# backfill 모드에서는 빈 페이지가 나올 때까지 게시판 전체를 훑음
+class BoardPager:
+    def __init__(self, institute_info, list_url, page_param='page', backfill=False,
+                 max_pages=None, workers=None, parse=None):
+        self.institute_info = institute_info
+        self.parse = parse or parse_full_page
+        self.list_url = list_url
+        self.page_param = page_param
+        self.backfill = backfill
+        self.max_pages = max_pages or (BACKFILL_MAX_PAGES if backfill else MAX_PAGES)
+        self.backfill_workers = workers or backfill_workers
+        self.watermark = get_crawl_state().last_seen_url(institute_info['id'])
+        self.newest_url = None
+        self._page_links = []
+        self._reached_known = False
+        # 조건부 요청으로 받은 첫 페이지 응답 (끝까지 정상적으로 돈 뒤에만 HTTP 캐시에 기록)
+        self._first_response = None
+
+    def page_url(self, page):
+        return self.list_url if page == 1 else with_page(self.list_url, self.page_param, page)
+
+    # 게시판 첫 페이지는 조건부 요청으로 받아 바뀐 게 없으면(304) None
+    def fetch_page(self, page):
+        institute_id = self.institute_info['id']
+        conditional = page == 1 and not self.backfill
+        # 요청 시간(fetch)에는 실제 요청만 넣고, 속도 제한·재시도 대기는 wait로 따로 기록
+        response = fetch(self.page_url(page), conditional=conditional, remember=False,
+                         on_retry=lambda error, delay: metrics.record_retry(institute_id),
+                         on_timing=lambda waited, sent: metrics.record_timing(institute_id, waited, sent))
+        if conditional and response is not None and response.ok:
+            self._first_response = response
+        if response is None:
+            metrics.record_fetch(institute_id, 304, 0)
+            return None
+        metrics.record_fetch(institute_id, response.status_code, len(response.content))
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'lxml')
-
-        items = soup.select('table.board_list tr') 
-        
-        for item in items[1:]:
-            try:
-                title_elem = item.select_one('td.subject a') 
-                date_elem = item.select_one('td.datetime') # 등록일 태그 (예시)
-
-                if not title_elem:
-                    continue
-
-                title = title_elem.get_text(strip=True).strip()
-                link = title_elem.get('href')
-                
-                if link and not link.startswith('http'):
-                    link = base_url + link
-
-                if title and link and is_new_material(materials, title, institute_info['name']):
-                    material_id = f"id_{institute_info['id']}_{len(materials) + 1}"
-                    
-                    # -------------------------------------------------------------
-                    # 💡 개선된 자료 정보 추출 로직 (부산도 동일하게 적용) 💡
-                    # -------------------------------------------------------------
-                    detected_type = "report"
-                    if "지도안" in title or "수업자료" in title:
-                        detected_type = "guide"
-                    
-                    detected_year = "미상"
-                    if date_elem:
-                        full_date_str = date_elem.get_text(strip=True) # 예: 2025-09-29
-                        try:
-                            detected_year = str(datetime.strptime(full_date_str, '%Y-%m-%d').year)
-                        except ValueError:
-                            pass
-                    else:
-                        detected_year = str(datetime.now().year)
-
-                    detected_tags = [institute_info['region'], institute_info['id']]
-                    if "AI" in title: detected_tags.append("AI")
-                    if "미래교육" in title: detected_tags.append("미래교육")
-                    if "창의성" in title: detected_tags.append("창의성")
-                    if "수학" in title: detected_tags.append("수학")
-                    # -------------------------------------------------------------
-
-                    new_material = {
-                        "id": material_id,
-                        "title": title,
-                        "institute": institute_info['name'],
-                        "type": detected_type,
-                        "year": detected_year,
-                        "tags": list(set(detected_tags)),
-                        "url": link
-                    }
-                    materials.append(new_material)
-                    print(f"    - 새 자료 추가: {title} (유형: {detected_type}, 연도: {detected_year})")
-            except Exception as e:
-                print(f"    - 자료 추출 중 오류 발생: {e} in {institute_info['name']}")
-                
-    except requests.exceptions.RequestException as e:
-        print(f"  > 요청 오류: {institute_info['name']} - {e}")
-    except Exception as e:
-        print(f"  > 부산교육연구소 크롤링 중 알 수 없는 오류: {e}")
-    
-    return materials
+        with metrics.timer('parse', institute_id):
+            return self.parse(response.text)
+
+    # 크롤러가 행마다 호출: 새 자료면 True, 이미 아는 자료면 이 페이지에서 멈추도록 표시
+    # 고정 공지 행(pinned)은 모든 페이지 맨 위에 반복되므로 새 자료인지만 보고 멈춤·워터마크에는 쓰지 않음
+    def is_new(self, materials, title, link, pinned=False):
+        if pinned:
+            return is_new_material(materials, title, self.institute_info['name'], link)
+        if self.newest_url is None:
+            self.newest_url = link
+        self._page_links.append(link)
+        if self.backfill:
+            return is_new_material(materials, title, self.institute_info['name'], link)
+        if link == self.watermark or not is_new_material(materials, title, self.institute_info['name'], link):
+            self._reached_known = True
+            return False
+        return True
+
+    def _pages(self):
+        if not self.backfill:
+            for page in range(1, self.max_pages + 1):
+                yield page, self.fetch_page(page)
+            return
+        # backfill: 같은 호스트라 요청 간격은 지키되, 다음 페이지들을 미리 받아 두고 파싱과 겹침
+        with ThreadPoolExecutor(max_workers=max(1, self.backfill_workers)) as executor:
+            for start in range(1, self.max_pages + 1, self.backfill_workers):
+                pages = range(start, min(start + self.backfill_workers, self.max_pages + 1))
+                futures = [(page, executor.submit(self.fetch_page, page)) for page in pages]
+                for page, future in futures:
+                    yield page, future.result()
+
+    def __iter__(self):
+        previous_links = None
+        pages = self._pages()
+        try:
+            for page, soup in pages:
+                if soup is None:
+                    print(f"  > {self.institute_info['name']} 게시판 변경 없음 (304). 건너뜁니다.")
+                    return
+                self._page_links = []
+                yield soup
+                # 빈 페이지 또는 마지막 페이지를 반복해서 돌려주는 게시판이면 끝
+                if not self._page_links or self._page_links == previous_links:
+                    break
+                if self._reached_known:
+                    print(f"  > {page}페이지에서 이미 수집한 게시글을 만나 중단합니다.")
+                    break
+                previous_links = self._page_links
+        finally:
+            pages.close()
+        # 끝까지 정상적으로 돌았을 때만 워터마크와 첫 페이지의 ETag/Last-Modified 갱신
+        # (중간에 실패하면 다음 실행에서 304를 받지 않고 게시판을 다시 훑음)
+        if self.newest_url:
+            get_crawl_state().update(self.institute_info['id'], self.newest_url)
+        if self._first_response is not None:
+            get_http_cache().remember(self.list_url, self._first_response)
+
+# 자료 저장하기 (임시 파일에 쓴 뒤 교체하므로 중간에 중단되어도 기존 파일은 안전)
+def save_materials(materials):
+    write_json_atomic(MATERIALS_FILE, materials)
 
-# 대구창의융합교육원 크롤링 함수
-def crawl_daegu_institute(materials, institute_info):
-    base_url = "https://www.dge.go.kr/"
-    print(f"  > {institute_info['name']} 크롤링 시작...")
+# 새로 찾은 자료와 기존 자료의 변경 기록을 저널에 덧붙임 (전체 파일을 다시 쓰지 않음)
+def journal_materials(new_materials, updates=()):
+    append_journal(MATERIALS_JOURNAL_FILE, list(new_materials) + list(updates))
 
+# 스냅샷이 없거나 저널이 충분히 커졌을 때만 스냅샷을 다시 씀
+def should_compact():
+    if not os.path.exists(MATERIALS_FILE):
+        return True
     try:
-        # 대구창의융합교육원 자료실 URL (예시)
-        response = requests.get(f"{base_url}/board/list.do?boardId=BBS_0000008", timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'lxml')
-        
-        items = soup.select('table.board_list tbody tr') 
-        
-        for item in items:
-            try:
-                title_elem = item.select_one('td.title a') 
-                date_elem = item.select_one('td.reg_dt') # 등록일 태그 (예시)
-
-                if not title_elem:
-                    continue
-
-                title = title_elem.get_text(strip=True).strip()
-                link = title_elem.get('href')
-                
-                if link and not link.startswith('http'):
-                    link = base_url + link
-
-                if title and link and is_new_material(materials, title, institute_info['name']):
-                    material_id = f"id_{institute_info['id']}_{len(materials) + 1}"
-                    
-                    # -------------------------------------------------------------
-                    # 💡 개선된 자료 정보 추출 로직 (대구도 동일하게 적용) 💡
-                    # -------------------------------------------------------------
-                    detected_type = "report"
-                    if "지도안" in title or "수업자료" in title or "융합프로젝트" in title:
-                        detected_type = "guide"
-                    
-                    detected_year = "미상"
-                    if date_elem:
-                        full_date_str = date_elem.get_text(strip=True) # 예: 2025-09-29
-                        try:
-                            detected_year = str(datetime.strptime(full_date_str, '%Y-%m-%d').year)
-                        except ValueError:
-                            pass
-                    else:
-                        detected_year = str(datetime.now().year)
-
-                    detected_tags = [institute_info['region'], institute_info['id']]
-                    if "창의" in title: detected_tags.append("창의")
-                    if "융합" in title: detected_tags.append("융합")
-                    if "과학" in title: detected_tags.append("과학")
-                    if "수학" in title: detected_tags.append("수학")
-                    # -------------------------------------------------------------
-
-                    new_material = {
-                        "id": material_id,
-                        "title": title,
-                        "institute": institute_info['name'],
-                        "type": detected_type,
-                        "year": detected_year,
-                        "tags": list(set(detected_tags)),
-                        "url": link
-                    }
-                    materials.append(new_material)
-                    print(f"    - 새 자료 추가: {title} (유형: {detected_type}, 연도: {detected_year})")
-            except Exception as e:
-                print(f"    - 자료 추출 중 오류 발생: {e} in {institute_info['name']}")
-                
-    except requests.exceptions.RequestException as e:
-        print(f"  > 요청 오류: {institute_info['name']} - {e}")
-    except Exception as e:
-        print(f"  > 대구창의융합교육원 크롤링 중 알 수 없는 오류: {e}")
-    
-    return materials
+        return os.path.getsize(MATERIALS_JOURNAL_FILE) >= JOURNAL_COMPACT_BYTES
+    except FileNotFoundError:
+        return False
 
-# 인천교육과학정보원 크롤링 함수
-def crawl_incheon_institute(materials, institute_info):
-    base_url = "https://ienet.ice.go.kr/"
-    print(f"  > {institute_info['name']} 크롤링 시작...")
+# 저널 내용을 반영한 스냅샷을 저장하고 저널 비우기
+def compact_materials(materials):
+    save_materials(materials)
+    clear_journal(MATERIALS_JOURNAL_FILE)
+
+# 페이지가 받아 가는 데이터의 배포용 파일(공백 없는 JSON, .gz/.br, 내용 해시 이름)과 data/current.json 저장
+def publish_data(materials, search_index, institutes):
+    pointer = publish_artifacts({
+        "all_materials": materials,
+        "search_index": search_index,
+        "institutes": institutes,
+    })
+    print("배포용 파일 저장: " + ", ".join(f"{name} {entry['hash']}" for name, entry in pointer['files'].items()))
+    return pointer
+
+# 게시판 크롤러 기본 설정 (institutes.json의 "crawler" 항목에서 필요한 값만 덮어씀)
+# 선택자는 앞에서부터 차례로 시도해 처음으로 찾은 결과를 사용
+DEFAULT_BOARD_CONFIG = {
+    "page_param": "page",
+    "row_selectors": ["table.board_list tbody tr", ".board_list tbody tr", ".board_wrap table tbody tr"],
+    "skip_rows": 0,
+    # 모든 페이지 맨 위에 고정되는 공지 행 (선택자에 맞거나 첫 칸이 아래 글자면 공지 행으로 봄)
+    "pinned_row_selectors": ["tr.notice", "tr.bo_notice", "tr.notice_tr", "tr.tr_notice"],
+    "pinned_labels": ["공지"],
+    "title_selectors": ["td.subject a", "td.title a", "td.tit a"],
+    "date_selectors": ["td.date", "td.reg_dt", "td.datetime"],
+    "date_formats": ["%Y-%m-%d", "%Y.%m.%d"],
+    "id_format": "id_{id}_{n}",
+    # 유형 규칙과 태그 어휘는 data/taxonomy.json을 함께 쓰고, 연구원별로 추가할 키워드만 여기에 둠
+    "guide_keywords": [],
+    "base_tags": None,
+    "keywords": [],
+    # 빠른 파싱: 이 태그들만 트리로 만듦 (null이면 항상 페이지 전체를 파싱)
+    "parse_only": ["table"],
+}
+
+# 공통 분류 어휘 (data/taxonomy.json, 처음 쓸 때 불러옴)
+taxonomy = None
+classifiers = {}
+classifiers_lock = threading.Lock()
+
+def get_taxonomy():
+    global taxonomy
+    if taxonomy is None:
+        taxonomy = load_taxonomy()
+    return taxonomy
+
+# 연구원별 분류기 (공통 어휘 + 연구원 설정의 추가 키워드를 오토마톤 하나로 컴파일해 재사용)
+def classifier_for(institute):
+    with classifiers_lock:
+        classifier = classifiers.get(institute['id'])
+        if classifier is None:
+            config = institute.get('crawler', {})
+            extra_types = {"guide": config['guide_keywords']} if config.get('guide_keywords') else None
+            classifier = build_classifier(get_taxonomy(), config.get('keywords', []), extra_types)
+            classifiers[institute['id']] = classifier
+        return classifier
+
+# 연구원마다 모든 자료에 붙이는 기본 태그 (설정이 없으면 지역명과 연구원 id)
+def base_tags_for(institute):
+    base_tags = institute.get('crawler', {}).get('base_tags')
+    if base_tags is None:
+        base_tags = [institute['region'], institute['id']]
+    return list(base_tags)
+
+# 연구원별 상세 페이지 파서 (crawler 설정의 "detail" 항목 사용)
+detail_parsers = {}
+
+def detail_parser_for(institute):
+    with classifiers_lock:
+        parser = detail_parsers.get(institute['id'])
+        if parser is None:
+            parser = DetailParser(get_taxonomy(), institute.get('crawler', {}).get('detail'))
+            detail_parsers[institute['id']] = parser
+        return parser
+
+# 새로 찾은 자료와, 지난 실행에서 상세 정보를 받지 못한 기존 자료의 상세 페이지를 받아
+# 교과, 학년, 발행일, 첨부파일을 채움 (새 자료 먼저, 기존 자료는 최근 자료부터 시간 예산 안에서)
+def enrich_pending_materials(materials, existing_count, institutes, workers=DEFAULT_ENRICH_WORKERS):
+    by_name = {institute['name']: institute for institute in institutes}
+    cache = DetailCache()
+
+    def on_error(material, error):
+        institute = by_name.get(material.get('institute'))
+        if institute:
+            metrics.record_error(institute['id'], 'enrich', error)
+        print(f"    - 상세 정보 수집 중 오류 발생: {material.get('title')} - {error}")
+
+    new_materials = materials[existing_count:]
+    pending = [material for material in reversed(materials[:existing_count]) if needs_details(material, cache)]
+    targets = [material for material in new_materials + pending if material.get('institute') in by_name]
+    stats = enrich_materials(
+        targets,
+        lambda url: fetch(url, conditional=False),
+        lambda material: detail_parser_for(by_name[material['institute']]),
+        cache,
+        workers=workers,
+        on_error=on_error,
+        budget=budget,
+        reserve=ENRICH_RESERVE,
+    )
+    cache.save()
+    print(f"상세 정보 수집 대상: 새 자료 {len(new_materials)}개, 이전에 받지 못한 자료 {len(pending)}개")
+    print(f"상세 정보 수집: 새로 받음 {stats['fetched']}개, 캐시 사용 {stats['cached']}개, "
+          f"실패 {stats['failed']}개, 다음 실행으로 미룸 {stats['deferred']}개")
+    return stats
+
+# 저장된 자료의 링크를 확인해 status(응답 코드)와 last_checked 기록
+# 마지막 확인 후 max_age_days가 지난 링크만 다시 확인하고, 확인한 자료 수를 돌려줌
+def check_material_links(materials, workers=DEFAULT_LINK_WORKERS, max_age_days=DEFAULT_LINK_MAX_AGE_DAYS):
+    due = links_due(materials, max_age_days)
+    print(f"링크 확인 대상: {len(due)}개 (전체 {len(materials)}개)")
+
+    def on_error(url, error):
+        print(f"    - 링크 확인 중 오류 발생: {url} - {error}")
+
+    stats = check_links(
+        due,
+        lambda url: check_request(url, 'HEAD'),
+        lambda url: check_request(url, 'GET'),
+        budget,
+        workers=workers,
+        on_error=on_error,
+    )
+    print(f"링크 확인: 정상 {stats['ok']}개, 오류 응답 {stats['broken']}개, 접속 실패 {stats['unreachable']}개, "
+          f"다음 실행으로 미룸 {stats['deferred']}개")
+    metrics.set_total('links_checked', len(due) - stats['deferred'])
+    metrics.set_total('links_broken', sum(1 for material in materials if is_broken(material)))
+    return len(due) - stats['deferred']
+
+# 분류 어휘가 바뀌었을 때 전체 자료의 유형과 태그를 다시 계산
+# 어휘에 없는 태그(기본 태그, 직접 입력한 태그)는 그대로 두고, 규칙에 걸리지 않으면 기존 유형 유지
+def retag_materials(materials, institutes):
+    by_name = {institute['name']: institute for institute in institutes}
+    changed = 0
+    for material in materials:
+        institute = by_name.get(material.get('institute'))
+        if institute is None:
+            continue
+        classifier = classifier_for(institute)
+        detected_type, tags = classifier.classify(material.get('title'))
+        vocabulary = classifier.tag_labels
+        kept_tags = [tag for tag in material.get('tags', []) if tag not in vocabulary]
+        new_tags = list(dict.fromkeys(kept_tags + tags))
+        new_type = detected_type or material.get('type')
+        if new_tags != material.get('tags') or new_type != material.get('type'):
+            material['tags'] = new_tags
+            material['type'] = new_type
+            changed += 1
+    return changed
+
+# 설정으로 동작하는 공통 게시판 크롤러
+class BoardCrawler:
+    def __init__(self, institute_info):
+        self.institute_info = institute_info
+        self.config = {**DEFAULT_BOARD_CONFIG, **institute_info['crawler']}
+        # 선택자는 연구원마다 한 번만 컴파일해서 모든 행에 재사용
+        self.row_selectors = [soupsieve.compile(sel) for sel in self.config['row_selectors']]
+        self.title_selectors = [soupsieve.compile(sel) for sel in self.config['title_selectors']]
+        self.date_selectors = [soupsieve.compile(sel) for sel in self.config['date_selectors']]
+        self.pinned_row_selectors = [soupsieve.compile(sel) for sel in self.config['pinned_row_selectors']]
+        self.pinned_labels = set(self.config['pinned_labels'])
+        self.classifier = classifier_for(institute_info)
+        parse_only = self.config['parse_only']
+        self.strainer = SoupStrainer(parse_only) if parse_only else None
+        # 빠른 파싱 트리에서는 앞에서부터 이어지는 안전한 선택자만 시도 (앞선 선택자가 안전하지 않으면
+        # 전체 트리에서 그 선택자가 먼저 맞을 수 있으므로 그 뒤 선택자도 쓰지 않음)
+        kept_tags = [parse_only] if isinstance(parse_only, str) else (parse_only or [])
+        self.strained_row_selectors = []
+        for selector, source in zip(self.row_selectors, self.config['row_selectors']):
+            if not strain_safe(source, kept_tags):
+                break
+            self.strained_row_selectors.append(selector)
+
+    @staticmethod
+    def _select_first(selectors, node):
+        for selector in selectors:
+            found = selector.select_one(node)
+            if found is not None:
+                return found
+        return None
+
+    def find_rows(self, soup, selectors=None):
+        for selector in self.row_selectors if selectors is None else selectors:
+            rows = selector.select(soup)
+            if rows:
+                return rows[self.config['skip_rows']:]
+        return []
 
-    try:
-        # 인천교육과학정보원 자료실 URL (예시)
-        response = requests.get(f"{base_url}/boardCnts/list.do?boardID=1624&m=0301&s=ice", timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'lxml')
-        
-        items = soup.select('table.board_type01 tbody tr') # 예시 셀렉터
-        
+    # 게시판 표 부분만 트리로 만들어 파싱 시간을 줄임
+    # 표만으로 안전하게 찾을 수 있는 선택자가 없거나, 그 선택자로 행을 찾지 못하면 페이지 전체를 파싱
+    def parse_page(self, html):
+        if self.strainer is not None and self.strained_row_selectors:
+            soup = BeautifulSoup(html, 'lxml', parse_only=self.strainer)
+            if self.find_rows(soup, self.strained_row_selectors):
+                return soup
+        return parse_full_page(html)
+
+    # 고정 공지 행인지 확인 (행 선택자, 또는 첫 칸의 글자나 아이콘 대체 글자가 "공지")
+    def is_pinned(self, row):
+        if any(selector.match(row) for selector in self.pinned_row_selectors):
+            return True
+        first_cell = row.find(['td', 'th'])
+        if first_cell is None or not self.pinned_labels:
+            return False
+        if first_cell.get_text(strip=True) in self.pinned_labels:
+            return True
+        return any(img.get('alt', '').strip() in self.pinned_labels for img in first_cell.find_all('img'))
+
+    # 게시글 행마다 (제목, 절대 링크, 날짜 칸, 고정 공지 여부) 추출
+    def extract_rows(self, soup, page_url):
+        items = self.find_rows(soup)
+        metrics.record_rows(self.institute_info['id'], len(items))
+        if not items:
+            print(f"  > {self.institute_info['name']} 게시판에서 게시글 행을 찾지 못했습니다. 선택자를 확인하세요.")
         for item in items:
             try:
-                title_elem = item.select_one('td.tit a') 
-                date_elem = item.select_one('td.date') # 등록일 태그 (예시)
-
-                if not title_elem:
+                title_elem = self._select_first(self.title_selectors, item)
+                if title_elem is None:
                     continue
 
-                title = title_elem.get_text(strip=True).strip()
+                title = title_elem.get_text(strip=True)
                 link = title_elem.get('href')
-                
-                if link and not link.startswith('http'):
-                    link = base_url + link
-
-                if title and link and is_new_material(materials, title, institute_info['name']):
-                    material_id = f"id_{institute_info['id']}_{len(materials) + 1}"
-                    
-                    # -------------------------------------------------------------
-                    # 💡 개선된 자료 정보 추출 로직 (인천도 동일하게 적용) 💡
-                    # -------------------------------------------------------------
-                    detected_type = "report"
-                    if "지도안" in title or "수업자료" in title or "탐구보고서" in title:
-                        detected_type = "guide"
-                    
-                    detected_year = "미상"
-                    if date_elem:
-                        full_date_str = date_elem.get_text(strip=True) # 예: 2025.09.29 또는 2025-09-29
-                        try:
-                            detected_year = str(datetime.strptime(full_date_str.replace('.', '-'), '%Y-%m-%d').year)
-                        except ValueError:
-                            pass
-                    else:
-                        detected_year = str(datetime.now().year)
-
-                    detected_tags = [institute_info['region'], institute_info['id']]
-                    if "과학" in title: detected_tags.append("과학")
-                    if "정보" in title: detected_tags.append("정보")
-                    if "환경" in title: detected_tags.append("환경")
-                    # -------------------------------------------------------------
-
-                    new_material = {
-                        "id": material_id,
-                        "title": title,
-                        "institute": institute_info['name'],
-                        "type": detected_type,
-                        "year": detected_year,
-                        "tags": list(set(detected_tags)),
-                        "url": link
-                    }
-                    materials.append(new_material)
-                    print(f"    - 새 자료 추가: {title} (유형: {detected_type}, 연도: {detected_year})")
+                if link:
+                    link = urljoin(page_url, link)
+                yield title, link, self._select_first(self.date_selectors, item), self.is_pinned(item)
             except Exception as e:
-                print(f"    - 자료 추출 중 오류 발생: {e} in {institute_info['name']}")
-                
-    except requests.exceptions.RequestException as e:
-        print(f"  > 요청 오류: {institute_info['name']} - {e}")
-    except Exception as e:
-        print(f"  > 인천교육과학정보원 크롤링 중 알 수 없는 오류: {e}")
-    
-    return materials
-
-# 광주창의융합교육원 크롤링 함수
-def crawl_gwangju_institute(materials, institute_info):
-    base_url = "https://gice.gen.go.kr/"
-    print(f"  > {institute_info['name']} 크롤링 시작...")
-
-    try:
-        response = requests.get(f"{base_url}/cop/bbs/selectBoardList.do?bbsId=BBSMSTR_000000000101", timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'lxml')
-        
-        items = soup.select('table.board_list tbody tr') 
-        
-        for item in items:
+                metrics.record_error(self.institute_info['id'], 'extract', e)
+                print(f"    - 자료 추출 중 오류 발생: {e} in {self.institute_info['name']}")
+
+    # 날짜 칸에서 연도 추출 (날짜 칸이 없으면 올해, 읽을 수 없으면 "미상")
+    def detect_year(self, date_elem):
+        if date_elem is None:
+            return str(datetime.now().year)
+        date_text = date_elem.get_text(strip=True)
+        for date_format in self.config['date_formats']:
             try:
-                title_elem = item.select_one('td.subject a') 
-                date_elem = item.select_one('td.reg_dt') # 등록일 태그 (예시)
+                return str(datetime.strptime(date_text, date_format).year)
+            except ValueError:
+                pass
+        match = re.match(r'(\d{4})', date_text)
+        return match.group(1) if match else "미상"
+
+    # 제목을 한 번 훑어서 (유형, 태그) 결정
+    def classify(self, title):
+        detected_type, tags = self.classifier.classify(title)
+        return detected_type or "report", list(dict.fromkeys(base_tags_for(self.institute_info) + tags))
+
+    def build_material(self, materials, title, link, date_elem):
+        detected_type, detected_tags = self.classify(title)
+        return {
+            "id": self.config['id_format'].format(id=self.institute_info['id'], n=len(materials) + 1),
+            "title": title,
+            "institute": self.institute_info['name'],
+            "type": detected_type,
+            "year": self.detect_year(date_elem),
+            "tags": detected_tags,
+            "url": link
+        }
+
+    def crawl(self, materials, backfill=False):
+        name = self.institute_info['name']
+        institute_id = self.institute_info['id']
+        print(f"  > {name} 크롤링 시작...")
+        existing_count = len(materials)
+        completed = False
+
+        try:
+            pager = BoardPager(self.institute_info, self.config['list_url'],
+                               page_param=self.config['page_param'], backfill=backfill, parse=self.parse_page)
+            for soup in pager:
+                with metrics.timer('extract', institute_id):
+                    for title, link, date_elem, pinned in self.extract_rows(soup, pager.list_url):
+                        if title and link and pager.is_new(materials, title, link, pinned):
+                            new_material = self.build_material(materials, title, link, date_elem)
+                            materials.append(new_material)
+                            print(f"    - 새 자료 추가: {title} (유형: {new_material['type']}, 연도: {new_material['year']})")
+            completed = True
+
+        except TimeBudgetExceeded as e:
+            metrics.set_status(institute_id, 'over_budget')
+            print(f"  > {name} 실행 시간 예산을 넘어 다음 실행으로 미룹니다: {e}")
+        except requests.exceptions.RequestException as e:
+            metrics.record_error(institute_id, 'fetch', e)
+            print(f"  > 요청 오류: {name} - {e}")
+        except Exception as e:
+            metrics.record_error(institute_id, 'crawl', e)
+            print(f"  > {name} 크롤링 중 알 수 없는 오류: {e}")
+
+        # 평소 실행에서 게시판을 끝까지 보지 못했으면 이번에 찾은 자료를 버림
+        # (일부만 저장하면 다음 실행이 그 자료에서 멈춰 그 뒤 페이지를 영영 보지 못함)
+        # backfill은 아는 자료에서 멈추지 않으므로 모은 자료를 그대로 둠 (큰 게시판도 여러 번에 나눠 채울 수 있게)
+        if not completed and not backfill and len(materials) > existing_count:
+            print(f"  > {name} 게시판을 끝까지 보지 못해 이번에 찾은 {len(materials) - existing_count}개를 버리고 다음 실행에서 다시 수집합니다.")
+            if isinstance(materials, MaterialList):
+                materials.truncate(existing_count)
+            else:
+                del materials[existing_count:]
+        metrics.record_new_item(institute_id, len(materials) - existing_count)
+        return materials
+
+# institutes.json에 크롤러 설정이 있는 연구원만 크롤러 생성
+def find_crawler(institute):
+    if not institute.get('crawler', {}).get('list_url'):
+        return None
+    return BoardCrawler(institute)
+
+# 연구원 하나를 크롤링하고 새로 찾은 자료만 돌려줌 (materials는 이 연구원 전용 복사본)
+def crawl_institute(materials, institute, backfill=False):
+    print(f"\n--------------------------------------------------")
+    print(f"  > {institute['name']} 자료 수집 시도 중...")
 
-                if not title_elem:
-                    continue
+    crawler = find_crawler(institute)
+    if crawler is None:
+        print(f"  > {institute['name']} 에 대한 크롤러 설정이 없습니다. 스킵합니다.")
+        metrics.set_status(institute['id'], 'skipped')
+        return []
 
-                title = title_elem.get_text(strip=True).strip()
-                link = title_elem.get('href')
-                
-                if link and not link.startswith('http'):
-                    link = base_url + link
-
-                if title and link and is_new_material(materials, title, institute_info['name']):
-                    material_id = f"id_{institute_info['id']}_{len(materials) + 1}"
-                    
-                    # -------------------------------------------------------------
-                    # 💡 개선된 자료 정보 추출 로직 (광주도 동일하게 적용) 💡
-                    # -------------------------------------------------------------
-                    detected_type = "report"
-                    if "지도안" in title or "수업자료" in title or "창의체험" in title:
-                        detected_type = "guide"
-                    
-                    detected_year = "미상"
-                    if date_elem:
-                        full_date_str = date_elem.get_text(strip=True) 
-                        try:
-                            detected_year = str(datetime.strptime(full_date_str, '%Y-%m-%d').year)
-                        except ValueError:
-                            pass
-                    else:
-                        detected_year = str(datetime.now().year)
-
-                    detected_tags = [institute_info['region'], institute_info['id']]
-                    if "창의" in title: detected_tags.append("창의")
-                    if "융합" in title: detected_tags.append("융합")
-                    if "교육" in title: detected_tags.append("교육")
-                    # -------------------------------------------------------------
-
-                    new_material = {
-                        "id": material_id,
-                        "title": title,
-                        "institute": institute_info['name'],
-                        "type": detected_type,
-                        "year": detected_year,
-                        "tags": list(set(detected_tags)),
-                        "url": link
-                    }
-                    materials.append(new_material)
-                    print(f"    - 새 자료 추가: {title} (유형: {detected_type}, 연도: {detected_year})")
-            except Exception as e:
-                print(f"    - 자료 추출 중 오류 발생: {e} in {institute_info['name']}")
-                
-    except requests.exceptions.RequestException as e:
-        print(f"  > 요청 오류: {institute_info['name']} - {e}")
-    except Exception as e:
-        print(f"  > 광주창의융합교육원 크롤링 중 알 수 없는 오류: {e}")
-    
+    existing_count = len(materials)
+    crawled = crawler.crawl(materials, backfill=backfill)
+    return crawled[existing_count:]
+
+# 여러 연구원을 동시에 크롤링 (결과는 institutes.json 순서대로 합침)
+def crawl_all(materials, institutes, workers=DEFAULT_WORKERS, backfill=False):
+    if not isinstance(materials, MaterialList):
+        materials = MaterialList(materials)
+    for institute in institutes:
+        metrics.register(institute['id'])
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        # 연구원마다 복사본에서 크롤링하므로 동시에 실행해도 서로 간섭하지 않음
+        # (복사는 결과를 합치기 시작하기 전에 여기서 모두 끝냄)
+        futures = [executor.submit(crawl_institute, materials.copy(), institute, backfill) for institute in institutes]
+        for future in futures:
+            materials.extend(future.result())
     return materials
 
+# 명령행 옵션
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="교육연구원 자료 수집")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"동시에 크롤링할 연구원 수 (기본값: {DEFAULT_WORKERS}, 1이면 순차 실행)")
+    parser.add_argument("--backfill", action="store_true",
+                        help="이미 수집한 게시글에서 멈추지 않고 게시판 전체 페이지를 수집")
+    parser.add_argument("--enrich", action="store_true",
+                        help="새로 찾은 자료의 상세 페이지에서 교과, 학년, 발행일, 첨부파일 정보를 수집")
+    parser.add_argument("--enrich-workers", type=int, default=DEFAULT_ENRICH_WORKERS,
+                        help=f"상세 페이지를 동시에 받을 작업자 수 (기본값: {DEFAULT_ENRICH_WORKERS})")
+    parser.add_argument("--retag", action="store_true",
+                        help="크롤링하지 않고 data/taxonomy.json 기준으로 전체 자료의 유형과 태그를 다시 계산")
+    parser.add_argument("--backfill-workers", type=int, default=DEFAULT_BACKFILL_WORKERS,
+                        help=f"backfill 모드에서 게시판마다 미리 받아 둘 페이지 수 (기본값: {DEFAULT_BACKFILL_WORKERS})")
+    parser.add_argument("--check-links", action="store_true",
+                        help="저장된 자료의 링크가 살아 있는지 확인해 status와 last_checked를 기록")
+    parser.add_argument("--link-workers", type=int, default=DEFAULT_LINK_WORKERS,
+                        help=f"링크를 동시에 확인할 작업자 수 (기본값: {DEFAULT_LINK_WORKERS})")
+    parser.add_argument("--link-max-age", type=float, default=DEFAULT_LINK_MAX_AGE_DAYS,
+                        help=f"마지막 확인 후 이 일수가 지난 링크만 다시 확인 (기본값: {DEFAULT_LINK_MAX_AGE_DAYS})")
+    parser.add_argument("--compact", action="store_true",
+                        help="저널 크기와 상관없이 저널 내용을 all_materials.json에 반영하고 저널을 비움")
+    parser.add_argument("--time-budget", type=float, default=DEFAULT_TIME_BUDGET_MINUTES,
+                        help=f"이번 실행에 쓸 최대 시간(분), 0이면 제한 없음 (기본값: {DEFAULT_TIME_BUDGET_MINUTES})")
+    return parser.parse_args(argv)
 
 # 메인 함수
-def main():
+def main(argv=None):
+    global backfill_workers, budget, metrics, taxonomy
+    args = parse_args(argv)
+    backfill_workers = max(1, args.backfill_workers)
+    budget = RunBudget(args.time_budget * 60 if args.time_budget > 0 else None)
+    metrics = RunMetrics()
+    taxonomy = None
+    classifiers.clear()
+    detail_parsers.clear()
+
     # 기존 자료 불러오기
-    materials = load_existing_materials()
+    with metrics.timer('load'):
+        materials = load_existing_materials()
     print(f"기존 자료 수: {len(materials)}")
     
     # 연구원 정보 불러오기
@@ -431,31 +849,72 @@ def main():
     if not institutes:
         print("연구원 정보를 찾을 수 없습니다.")
         return
+
+    # 분류 어휘만 바뀐 경우: 크롤링 없이 전체 자료 다시 분류
+    if args.retag:
+        changed = retag_materials(materials, institutes)
+        print(f"유형 또는 태그가 바뀐 자료: {changed}개")
+        if changed or os.path.exists(MATERIALS_JOURNAL_FILE):
+            compact_materials(materials)
+            search_index = save_search_index(materials)
+            save_shards(materials, institutes)
+            publish_data(materials, search_index, institutes)
+        return
     
-    # 각 연구원별로 크롤링 실행
-    for institute in institutes:
-        print(f"\n--------------------------------------------------")
-        print(f"  > {institute['name']} 자료 수집 시도 중...")
-        
-        if "서울교육연구정보원" in institute['name']:
-            materials = crawl_seoul_institute(materials, institute)
-        elif "부산교육연구소" in institute['name']:
-            materials = crawl_busan_institute(materials, institute)
-        elif "대구창의융합교육원" in institute['name']:
-            materials = crawl_daegu_institute(materials, institute)
-        elif "인천교육과학정보원" in institute['name']:
-            materials = crawl_incheon_institute(materials, institute)
-        elif "광주창의융합교육원" in institute['name']: 
-            materials = crawl_gwangju_institute(materials, institute)
+    # 각 연구원별로 크롤링 실행 (같은 호스트 요청 간격과 재시도는 fetch()가 처리)
+    existing_count = len(materials)
+    with metrics.timer('crawl'):
+        materials = crawl_all(materials, institutes, workers=args.workers, backfill=args.backfill)
+    tracked = tracked_fields(materials[:existing_count])
+
+    # 새 자료(와 지난 실행에서 받지 못한 자료)의 상세 페이지에서 추가 정보 수집 (선택)
+    if args.enrich:
+        with metrics.timer('enrich'):
+            stats = enrich_pending_materials(materials, existing_count, institutes, workers=args.enrich_workers)
+        metrics.set_total('enriched', stats['fetched'] + stats['cached'])
+
+    # 저장된 링크 확인 (선택, 새 자료도 함께 확인)
+    if args.check_links:
+        with metrics.timer('link_check'):
+            check_material_links(materials, workers=args.link_workers, max_age_days=args.link_max_age)
+    sessions.close()
+
+    # 제목이 거의 같은 자료(띄어쓰기·괄호 차이, 여러 연구원 재게시)에 대표 자료 id 기록
+    # 기존 자료를 먼저 색인한 뒤 새 자료를 이어서 넣으므로 대표 자료는 실행마다 같게 유지됨
+    with metrics.timer('near_duplicates'):
+        duplicate_index = NearDuplicateIndex()
+        mark_near_duplicates(materials[:existing_count], duplicate_index)
+        mark_near_duplicates(materials[existing_count:], duplicate_index)
+    duplicates = sum(1 for material in materials if 'duplicate_of' in material)
+    metrics.set_total('near_duplicates', duplicates)
+    print(f"근접 중복으로 표시된 자료: {duplicates}개")
+
+    # 새 자료와 기존 자료의 변경은 저널에만 덧붙이고, 저널이 커졌을 때(또는 --compact)만 스냅샷을 다시 씀
+    with metrics.timer('save'):
+        updates = field_updates(materials[:existing_count], tracked)
+        journal_materials(materials[existing_count:], updates)
+        if args.compact or should_compact():
+            compact_materials(materials)
         else:
-            print(f"  > {institute['name']} 에 대한 크롤링 함수가 없습니다. 스킵합니다.")
-            
-        # 크롤링 사이에 잠시 대기 (서버 부하 방지 및 차단 방지)
-        time.sleep(random.uniform(2, 5)) # 2초에서 5초 사이 랜덤 대기
-
-    # 수집한 자료 저장
-    save_materials(materials)
+            print(f"새 자료 {len(materials) - existing_count}개와 변경 {len(updates)}건을 저널에만 기록했습니다.")
+        search_index = save_search_index(materials)
+        save_shards(materials, institutes)
+        publish_data(materials, search_index, institutes)
+        save_feeds(materials[existing_count:])
+        get_http_cache().save()
+        get_crawl_state().save()
+
+    # 실행 보고서 기록
+    metrics.set_total('existing', existing_count)
+    metrics.set_total('new', len(materials) - existing_count)
+    metrics.set_total('total', len(materials))
+    report = save_run_report(metrics)
     print(f"\n--------------------------------------------------")
+    for institute_id, record in report['latest']['institutes'].items():
+        if record['status'] != 'skipped':
+            print(f"  > {institute_id}: {record['status']} (요청 {record['requests']}, 행 {record['rows_matched']}, "
+                  f"새 자료 {record['new_items']}, 재시도 {record['retries']}, 오류 {len(record['errors'])}, "
+                  f"요청 시간 {record['fetch_seconds']}초, 대기 {record['wait_seconds']}초)")
     print(f"자료 수집 완료. 총 {len(materials)}개의 자료가 있습니다.")
 
 # 스크립트 실행